@@ -4,8 +4,14 @@ Detects battle state transitions, tracks battle statistics,
 and provides battle context to the LLM using type effectiveness data.
 """
 
+import array
+import functools
+import io
+import itertools
 import json
 import logging
+import sys
+from types import MappingProxyType
 
 from config import settings
 
@@ -125,6 +131,87 @@ MOVE_TYPES = {
     "Meteor Mash": "Steel", "Iron Defense": "Steel",
 }
 
+# Intern the name keys so lookups with names from GameState (interned in
+# memory_reader) hit the identity fast path instead of comparing characters,
+# and freeze both tables so they can be shared read-only across threads
+SPECIES_TYPES = MappingProxyType(
+    {sys.intern(name): tuple(types) for name, types in SPECIES_TYPES.items()}
+)
+MOVE_TYPES = MappingProxyType(
+    {sys.intern(move): mtype for move, mtype in MOVE_TYPES.items()}
+)
+
+# Gen 3 type order -> dense integer ids used to index the effectiveness table
+TYPE_NAMES = (
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison",
+    "Ground", "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel",
+)
+TYPE_ID = {name: i for i, name in enumerate(TYPE_NAMES)}
+N_TYPES = len(TYPE_NAMES)
+
+# Second-type slot value for mono-type species
+NO_TYPE = 0xFF
+
+# Species name -> (type id, type id or NO_TYPE), resolved once at import
+SPECIES_TYPE_IDS = {
+    name: (TYPE_ID[types[0]], TYPE_ID[types[1]] if len(types) > 1 else NO_TYPE)
+    for name, types in SPECIES_TYPES.items()
+}
+
+# Same pairs packed into 2-byte values for the battle hot path
+SPECIES_TYPE_BYTES = {name: bytes(pair) for name, pair in SPECIES_TYPE_IDS.items()}
+
+# Move name -> type id, resolved once at import
+MOVE_TYPE_ID = {move: TYPE_ID[mtype] for move, mtype in MOVE_TYPES.items()}
+
+# Shared read-only result for ticks with no battle transition
+_NO_EVENTS = MappingProxyType({})
+
+
+@functools.lru_cache(maxsize=1)
+def _load_type_chart():
+    """
+    Load data/type_chart.json (once per process) into a flat float32 table.
+    Entry [aid * N_TYPES + did] is the multiplier of attack type aid against
+    defending type did. Missing pairs, or a missing file, default to 1.0.
+    """
+    chart = array.array("f", [1.0]) * (N_TYPES * N_TYPES)
+    try:
+        with open(settings.TYPE_CHART_FILE, "r") as f:
+            raw = json.load(f)
+    except Exception as e:
+        logger.warning("Could not load type chart: %s", e)
+        return chart
+
+    for attack_type, matchups in raw.items():
+        aid = TYPE_ID.get(attack_type)
+        if aid is None:
+            continue
+        for defend_type, mult in matchups.items():
+            did = TYPE_ID.get(defend_type)
+            if did is not None:
+                chart[aid * N_TYPES + did] = mult
+    return chart
+
+
+@functools.lru_cache(maxsize=1)
+def _load_species_effectiveness():
+    """
+    Precompute, per species, the multiplier of every attack type against it.
+    Returns {species_name: tuple indexed by attack type id}.
+    """
+    chart = _load_type_chart()
+    table = {}
+    for name, (d1, d2) in SPECIES_TYPE_BYTES.items():
+        if d2 == NO_TYPE:
+            table[name] = tuple(chart[aid * N_TYPES + d1] for aid in range(N_TYPES))
+        else:
+            table[name] = tuple(
+                chart[aid * N_TYPES + d1] * chart[aid * N_TYPES + d2]
+                for aid in range(N_TYPES)
+            )
+    return table
+
 
 class BattleManager:
     """Tracks battle state transitions and provides battle context."""
@@ -137,45 +224,42 @@ class BattleManager:
         self.battles_fled = 0
         self.whiteouts = 0
         self.prev_money = 0
-        self.prev_party_hp = []
-        self.type_chart = self._load_type_chart()
-
-    def _load_type_chart(self):
-        """Load the type effectiveness chart from data/type_chart.json."""
-        try:
-            with open(settings.TYPE_CHART_FILE, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Could not load type chart: {e}")
-            return {}
+        self.prev_party_hp = array.array("H")  # flat [hp0, max0, hp1, max1, ...]
+        self.chart = _load_type_chart()
+        self.species_eff = _load_species_effectiveness()
 
     def update(self, game_state):
         """
         Update battle tracking from the current game state.
-        Returns a dict with battle event info (if any transition occurred).
+        Returns a mapping with battle event info (empty if no transition occurred).
         """
         new_battle = game_state.in_battle
-        events = {}
 
-        if not self.in_battle and new_battle > 0:
+        # Common cases first: no transition possible, no events dict needed
+        if not self.in_battle:
+            if not new_battle:
+                return _NO_EVENTS
+        elif new_battle:
+            self.battle_turns += 1
+            return _NO_EVENTS
+
+        events = {}
+        if not self.in_battle:
             # Battle started
             self.in_battle = True
             self.battle_type = new_battle
             self.battle_turns = 0
-            self.prev_party_hp = [
-                (p.get("hp_current", 0), p.get("hp_max", 0))
-                for p in game_state.party
-            ]
+            self.prev_party_hp = array.array("H", itertools.chain.from_iterable(
+                zip(game_state.hp_cur, game_state.hp_max)
+            ))
             self.prev_money = game_state.money
             events["battle_start"] = "wild" if new_battle == 1 else "trainer"
-            logger.info(f"Battle started: {'wild' if new_battle == 1 else 'trainer'}")
+            logger.info("Battle started: %s", events["battle_start"])
 
-        elif self.in_battle and new_battle == 0:
+        else:
             # Battle ended
             self.in_battle = False
-            all_fainted = all(
-                p.get("hp_current", 0) == 0 for p in game_state.party
-            ) if game_state.party else False
+            all_fainted = bool(game_state.hp_cur) and not any(game_state.hp_cur)
 
             if all_fainted or game_state.money < self.prev_money:
                 self.whiteouts += 1
@@ -184,13 +268,10 @@ class BattleManager:
             else:
                 self.battles_won += 1
                 events["battle_end"] = "won"
-                logger.info(f"Battle ended: WON (total: {self.battles_won})")
+                logger.info("Battle ended: WON (total: %d)", self.battles_won)
 
             self.battle_type = 0
 
-        elif self.in_battle:
-            self.battle_turns += 1
-
         return events
 
     def get_battle_context(self, game_state):
@@ -201,60 +282,58 @@ class BattleManager:
         if not self.in_battle:
             return ""
 
-        parts = []
+        buf = io.StringIO()
         battle_label = "WILD" if self.battle_type == 1 else "TRAINER"
-        parts.append(f"IN BATTLE ({battle_label}) - Turn {self.battle_turns}")
+        buf.write(f"IN BATTLE ({battle_label}) - Turn {self.battle_turns}")
 
         # Recommend moves based on party's available moves
         if game_state.party:
-            parts.append("\nYour team:")
-            for i, pkmn in enumerate(game_state.party):
-                name = pkmn.get("species_name", "Unknown")
-                hp = pkmn.get("hp_current", 0)
-                hp_max = pkmn.get("hp_max", 1)
-                moves = pkmn.get("moves", [])
-                hp_pct = int(100 * hp / hp_max) if hp_max > 0 else 0
-                parts.append(f"  {i+1}. {name} HP:{hp}/{hp_max} ({hp_pct}%) Moves: {', '.join(moves)}")
+            buf.write("\n\nYour team:")
+            for i, pkmn in enumerate(game_state.party, start=1):
+                name = pkmn.species_name
+                hp = pkmn.hp_current
+                hp_max = pkmn.hp_max
+                moves = pkmn.moves
+                hp_pct = 100 * hp // hp_max if hp_max > 0 else 0
+                buf.write(f"\n  {i}. {name} HP:{hp}/{hp_max} ({hp_pct}%) Moves: {', '.join(moves)}")
 
         if self.battle_turns > 25:
-            parts.append("\nWARNING: This battle is dragging on. Consider using stronger moves or running.")
+            buf.write("\n\nWARNING: This battle is dragging on. Consider using stronger moves or running.")
 
-        return "\n".join(parts)
+        return buf.getvalue()
 
     def get_type_effectiveness(self, attack_type, defend_types):
         """Calculate type effectiveness multiplier."""
-        if not self.type_chart or not attack_type:
+        aid = TYPE_ID.get(attack_type)
+        if aid is None:
             return 1.0
 
         multiplier = 1.0
-        matchups = self.type_chart.get(attack_type, {})
-        for dtype in defend_types:
-            if dtype in matchups:
-                multiplier *= matchups[dtype]
+        chart = self.chart
+        base = aid * N_TYPES
+        # map() with the bound TYPE_ID.get resolves ids in C, one probe per type
+        for did in map(TYPE_ID.get, defend_types):
+            if did is not None:
+                multiplier *= chart[base + did]
 
         return multiplier
 
     def recommend_move(self, party_pokemon, enemy_name):
         """Recommend the best move against an enemy based on type chart."""
-        enemy_types = SPECIES_TYPES.get(enemy_name, [])
-        if not enemy_types:
+        eff = self.species_eff.get(enemy_name)
+        if eff is None:
             return None
 
-        best_move = None
-        best_effectiveness = 0
-
-        moves = party_pokemon.get("moves", [])
-        for move_name in moves:
-            if not move_name or move_name == "---":
-                continue
-            move_type = MOVE_TYPES.get(move_name)
-            if not move_type:
-                continue
-
-            effectiveness = self.get_type_effectiveness(move_type, enemy_types)
-            if effectiveness > best_effectiveness:
-                best_effectiveness = effectiveness
-                best_move = move_name
+        # One precomputed-table index per known move, then pick the best
+        best_move, best_effectiveness = max(
+            (
+                (move_name, eff[MOVE_TYPE_ID[move_name]])
+                for move_name in party_pokemon.moves
+                if move_name in MOVE_TYPE_ID
+            ),
+            key=lambda pair: pair[1],
+            default=(None, 0.0),
+        )
 
         if best_move and best_effectiveness > 1.0:
             return f"Use {best_move} (super effective x{best_effectiveness}!)"
@@ -3,32 +3,87 @@ PostgreSQL live feed push for the dashboard.
 Uses the same pattern as ClaudeScape: single row upsert to live_feed table.
 """
 
+import atexit
+import functools
 import json
 import logging
+import threading
+import time
 
 import psycopg2
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 _conn = None
 
+# Serialises every use of _conn (connect, execute, close): main, LiveFeedWriter
+# and SessionFlush all share the one connection.
+_conn_lock = threading.Lock()
+
+# Reconnect backoff: after a failed connect, skip attempts until _next_retry_at
+# (time.monotonic()); the wait doubles per failure up to RECONNECT_MAX_BACKOFF.
+RECONNECT_MAX_BACKOFF = 30.0
+_backoff = 0.0
+_next_retry_at = 0.0
+
+# Feed payloads may hold datetimes etc.; stringify anything json can't encode
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj, default=str).decode("utf-8")
+else:
+    _dumps = functools.partial(json.dumps, default=str)
+
+# Last screenshot successfully written to live_feed, to skip re-sending an
+# unchanged frame
+_last_screenshot = None
+
+# Background feed writer: queue_live_feed() parks the newest feed here and a
+# daemon thread writes it, so the game loop never waits on Postgres.
+_feed_lock = threading.Lock()
+_feed_ready = threading.Event()
+_pending_feed = None
+_feed_thread = None
+
+# Session stat coalescing: update_session() only records the latest values,
+# a daemon thread writes them out at most once per interval. Whatever is still
+# pending is written by end_session() and at interpreter exit.
+SESSION_FLUSH_INTERVAL = 1.0
+_session_lock = threading.Lock()         # guards _pending_sessions / _flushed_sessions
+_session_write_lock = threading.RLock()  # serialises session UPDATEs
+_flush_stop = threading.Event()
+_pending_sessions = {}   # session_id -> (ticks, badges, pokemon_caught, whiteouts)
+_flushed_sessions = {}   # session_id -> last values written
+_flush_thread = None
+
 
 def _get_conn():
-    """Get or create a persistent database connection."""
-    global _conn
+    """Get or create a persistent database connection (caller holds _conn_lock)."""
+    global _conn, _backoff, _next_retry_at
     if _conn is None or _conn.closed:
         url = settings.DATABASE_URL
         if not url:
             return None
+        if time.monotonic() < _next_retry_at:
+            return None
         try:
             _conn = psycopg2.connect(url)
             _conn.autocommit = True
             _init_table(_conn)
+            _backoff = 0.0
             logger.info("Connected to PostgreSQL")
         except Exception as e:
-            logger.warning(f"Could not connect to PostgreSQL: {e}")
+            _backoff = min(max(_backoff * 2, 1.0), RECONNECT_MAX_BACKOFF)
+            _next_retry_at = time.monotonic() + _backoff
+            logger.warning(
+                "Could not connect to PostgreSQL: %s (retrying in %.0fs)", e, _backoff,
+            )
             _conn = None
             return None
     return _conn
@@ -48,6 +103,8 @@ def _init_table(conn):
             "INSERT INTO live_feed (id, data) VALUES (1, '{}') "
             "ON CONFLICT (id) DO NOTHING"
         )
+        # Latest frame as raw JPEG, kept out of the JSON payload
+        cur.execute("ALTER TABLE live_feed ADD COLUMN IF NOT EXISTS screenshot BYTEA")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 id SERIAL PRIMARY KEY,
@@ -60,92 +117,205 @@ def _init_table(conn):
                 duration_secs INTEGER DEFAULT 0
             )
         """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION update_session_stats(
+                p_id INTEGER, p_ticks INTEGER, p_badges INTEGER,
+                p_caught INTEGER, p_whiteouts INTEGER, p_ended BOOLEAN DEFAULT FALSE
+            ) RETURNS void AS $$
+                UPDATE sessions
+                   SET ticks = p_ticks,
+                       badges = p_badges,
+                       pokemon_caught = p_caught,
+                       whiteouts = p_whiteouts,
+                       ended_at = CASE WHEN p_ended THEN NOW() ELSE ended_at END,
+                       duration_secs = EXTRACT(EPOCH FROM (NOW() - started_at))::int
+                 WHERE id = p_id
+            $$ LANGUAGE sql
+        """)
+        # Per-connection prepared statement so the per-tick feed update skips parse/plan
+        # ($2 NULL keeps the stored screenshot)
+        cur.execute(
+            "PREPARE live_feed_upd (jsonb, bytea) AS "
+            "UPDATE live_feed SET data = $1, "
+            "screenshot = COALESCE($2, screenshot), updated_at = NOW() WHERE id = 1"
+        )
 
 
 def init_db():
     """Initialize database connection and tables."""
-    conn = _get_conn()
+    with _conn_lock:
+        conn = _get_conn()
     if conn:
         logger.info("Database initialized")
     else:
         logger.warning("Database not available - dashboard will not update")
 
 
-def push_live_feed(feed_data):
-    """Push the latest tick data to PostgreSQL (upserts a single row)."""
-    try:
-        conn = _get_conn()
-        if conn is None:
-            return
-        with conn.cursor() as cur:
-            cur.execute(
-                "UPDATE live_feed SET data = %s, updated_at = NOW() WHERE id = 1",
-                (json.dumps(feed_data, default=str),),
+def _on_db_fail(action, exc):
+    """Log a failed DB call and drop the connection so the next call reconnects.
+
+    Caller holds _conn_lock.
+    """
+    global _conn
+    logger.warning("Failed to %s: %s", action, exc)
+    if _conn is not None:
+        try:
+            _conn.close()
+        except Exception:
+            pass
+    _conn = None
+
+
+def _db_guarded(action, default=None):
+    """
+    Decorator for DB calls: passes a live connection as the first argument,
+    returns *default* when no connection is available, and routes any
+    exception through _on_db_fail. The whole call runs under _conn_lock.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _conn_lock:
+                conn = _get_conn()
+                if conn is None:
+                    return default
+                try:
+                    return fn(conn, *args, **kwargs)
+                except Exception as e:
+                    _on_db_fail(action, e)
+                    return default
+        return wrapper
+    return decorator
+
+
+@_db_guarded("push live feed")
+def push_live_feed(conn, feed_data, screenshot_jpeg=None):
+    """Push the latest tick data to PostgreSQL (upserts a single row).
+
+    The screenshot goes to its own BYTEA column as raw JPEG and is only sent
+    when it differs from the stored one. Unchanged ticks are already filtered
+    out by the game loop (feed_key) before they get here.
+    """
+    global _last_screenshot
+    if screenshot_jpeg == _last_screenshot:
+        screenshot_jpeg = None
+    with conn.cursor() as cur:
+        cur.execute("EXECUTE live_feed_upd (%s, %s)", (_dumps(feed_data), screenshot_jpeg))
+    if screenshot_jpeg is not None:
+        _last_screenshot = screenshot_jpeg
+
+
+def queue_live_feed(feed_data, screenshot_jpeg=None):
+    """Hand the feed to the background writer and return immediately.
+
+    The live_feed table holds a single row, so a feed still waiting to be
+    written is simply replaced by the newer one.
+    """
+    global _pending_feed, _feed_thread
+    with _feed_lock:
+        _pending_feed = (feed_data, screenshot_jpeg)
+        if _feed_thread is None:
+            _feed_thread = threading.Thread(
+                target=_feed_writer_loop, daemon=True, name="LiveFeedWriter",
             )
-    except Exception as e:
-        logger.warning(f"Failed to push live feed: {e}")
-        global _conn
-        _conn = None
+            _feed_thread.start()
+    _feed_ready.set()
+
 
+def _feed_writer_loop():
+    global _pending_feed
+    while True:
+        _feed_ready.wait()
+        _feed_ready.clear()
+        with _feed_lock:
+            pending, _pending_feed = _pending_feed, None
+        if pending is not None:
+            push_live_feed(*pending)
 
-def create_session():
+
+@_db_guarded("create session")
+def create_session(conn):
     """Create a new session record. Returns the session ID."""
-    try:
-        conn = _get_conn()
-        if conn is None:
-            return None
-        with conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO sessions (started_at) VALUES (NOW()) RETURNING id"
-            )
-            row = cur.fetchone()
-            sid = row[0] if row else None
-            logger.info(f"Session created: #{sid}")
-            return sid
-    except Exception as e:
-        logger.warning(f"Failed to create session: {e}")
-        return None
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO sessions (started_at) VALUES (NOW()) RETURNING id"
+        )
+        row = cur.fetchone()
+        sid = row[0] if row else None
+        logger.info("Session created: #%s", sid)
+        return sid
 
 
 def update_session(session_id, ticks=0, badges=0, pokemon_caught=0, whiteouts=0):
-    """Update a running session's stats."""
-    try:
-        conn = _get_conn()
-        if conn is None:
-            return
-        with conn.cursor() as cur:
-            cur.execute(
-                """UPDATE sessions
-                   SET ticks = %s,
-                       badges = %s,
-                       pokemon_caught = %s,
-                       whiteouts = %s,
-                       duration_secs = EXTRACT(EPOCH FROM (NOW() - started_at))::int
-                   WHERE id = %s""",
-                (ticks, badges, pokemon_caught, whiteouts, session_id),
+    """Queue a running session's stats; the background flusher writes changes."""
+    global _flush_thread
+    stats = (ticks, badges, pokemon_caught, whiteouts)
+    with _session_lock:
+        if _flushed_sessions.get(session_id) == stats:
+            _pending_sessions.pop(session_id, None)
+        else:
+            _pending_sessions[session_id] = stats
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(
+                target=_session_flush_loop, daemon=True, name="SessionFlush",
             )
-    except Exception as e:
-        logger.warning(f"Failed to update session: {e}")
+            _flush_thread.start()
+
+
+def _session_flush_loop():
+    while not _flush_stop.wait(SESSION_FLUSH_INTERVAL):
+        _flush_sessions()
+
+
+def _stop_session_flusher():
+    """Stop the flusher thread and write out whatever is still pending."""
+    _flush_stop.set()
+    if _flush_thread is not None:
+        _flush_thread.join(timeout=SESSION_FLUSH_INTERVAL * 2)
+    _flush_sessions()
+
+
+atexit.register(_stop_session_flusher)
+
+
+def _flush_sessions():
+    """Write out every pending session update."""
+    with _session_write_lock:
+        with _session_lock:
+            pending = dict(_pending_sessions)
+            _pending_sessions.clear()
+        for session_id, stats in pending.items():
+            if _write_session(session_id, *stats):
+                with _session_lock:
+                    _flushed_sessions[session_id] = stats
+
+
+@_db_guarded("update session", default=False)
+def _write_session(conn, session_id, ticks, badges, pokemon_caught, whiteouts):
+    """UPDATE a running session's stats. Returns True on success."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT update_session_stats(%s, %s, %s, %s, %s)",
+            (session_id, ticks, badges, pokemon_caught, whiteouts),
+        )
+    return True
 
 
 def end_session(session_id, ticks=0, badges=0, pokemon_caught=0, whiteouts=0):
     """End a session with final stats."""
-    try:
-        conn = _get_conn()
-        if conn is None:
-            return
-        with conn.cursor() as cur:
-            cur.execute(
-                """UPDATE sessions
-                   SET ended_at = NOW(),
-                       ticks = %s,
-                       badges = %s,
-                       pokemon_caught = %s,
-                       whiteouts = %s,
-                       duration_secs = EXTRACT(EPOCH FROM (NOW() - started_at))::int
-                   WHERE id = %s""",
-                (ticks, badges, pokemon_caught, whiteouts, session_id),
-            )
-            logger.info(f"Session #{session_id} ended: {ticks} ticks")
-    except Exception as e:
-        logger.warning(f"Failed to end session: {e}")
+    # Hold the write lock so a concurrent flush can't land after the final UPDATE
+    with _session_write_lock:
+        _flush_sessions()
+        with _session_lock:
+            _flushed_sessions.pop(session_id, None)
+        _write_session_end(session_id, ticks, badges, pokemon_caught, whiteouts)
+
+
+@_db_guarded("end session")
+def _write_session_end(conn, session_id, ticks, badges, pokemon_caught, whiteouts):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT update_session_stats(%s, %s, %s, %s, %s, TRUE)",
+            (session_id, ticks, badges, pokemon_caught, whiteouts),
+        )
+        logger.info("Session #%s ended: %d ticks", session_id, ticks)
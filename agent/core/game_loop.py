@@ -7,18 +7,18 @@ Runs continuously until stopped.
 import logging
 import signal
 import time
-import traceback
-from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from config import settings
 from agent.core.screen_capture import ScreenCapture
-from agent.core.vision import VisionEngine
+from agent.core.vision import VisionEngine, build_system_prompt
 from agent.core import input_handler
-from agent.core.memory_reader import GameState
+from agent.core.memory_reader import GameStateWatcher
 from agent.core.battle_manager import BattleManager
 from agent.core.player_stats import PlayerStats
 from agent.core.navigator import Navigator
-from agent.core.db import push_live_feed, create_session, update_session, end_session
+from agent.core.db import queue_live_feed, create_session, update_session, end_session
 from agent.memory.chroma_store import ChromaStore
 from agent.memory.memory_types import MemoryType
 from agent.planning.goal_planner import GoalPlanner
@@ -26,6 +26,18 @@ from agent.ui.overlay import Overlay
 
 logger = logging.getLogger(__name__)
 
+# An identical error is logged with its traceback at most this often
+ERROR_REPEAT_LOG_SECONDS = 5.0
+
+# Overlay / dashboard updates with unchanged content are skipped, but still
+# sent once per this many ticks so tick counters and uptime stay fresh
+UNCHANGED_REFRESH_TICKS = 5
+
+# Decisions on these screens are never reused: a cursor move or the next line
+# of dialogue barely changes the frame, and replaying A/DOWN there would
+# confirm prompts the model never read
+UNCACHED_PHASES = frozenset({"battle", "dialogue", "menu", "unknown"})
+
 
 class GameLoop:
     """
@@ -37,8 +49,13 @@ class GameLoop:
         logger.info("Initializing Pokemon AI Agent...")
 
         self.screen = ScreenCapture()
+        self.screen.start_async()
+        self.state_watcher = GameStateWatcher()
+        self.state_watcher.start()
         self.vision = VisionEngine()
         self.memory = ChromaStore()
+        # Vector search runs here so it overlaps with the rest of the tick
+        self._mem_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-query")
         self.planner = GoalPlanner()
         self.battle = BattleManager()
         self.stats = PlayerStats()
@@ -48,9 +65,16 @@ class GameLoop:
         self.running = False
         self.loop_count = 0
         self.consecutive_errors = 0
-        self.start_time = None
+        self.start_time_ns = None
+        self._last_exc_key = None
+        self._last_exc_at = 0.0
+        self._last_overlay_key = None
+        self._last_feed_key = None
         self.session_id = None
-        self.recent_actions = []
+        self.recent_actions = deque(maxlen=20)
+
+        # Decision cache: (screen hash, state digest) -> (expires_at, analysis)
+        self._analysis_cache = OrderedDict()
 
         # Overlay
         self.overlay = None
@@ -104,7 +128,7 @@ class GameLoop:
         """Main game loop - runs until stopped."""
         self.setup()
         self.running = True
-        self.start_time = time.time()
+        self.start_time_ns = time.monotonic_ns()
         self.session_id = create_session()
 
         logger.info("=" * 60)
@@ -126,8 +150,14 @@ class GameLoop:
                 break
             except Exception as e:
                 self.consecutive_errors += 1
-                logger.error(f"Game loop error ({self.consecutive_errors}): {e}")
-                logger.error(traceback.format_exc())
+                exc_key = (type(e), str(e)[:64])
+                now = time.monotonic()
+                if (exc_key != self._last_exc_key
+                        or now - self._last_exc_at >= ERROR_REPEAT_LOG_SECONDS):
+                    logger.exception("Game loop error (%d): %s", self.consecutive_errors, e)
+                    self._last_exc_key, self._last_exc_at = exc_key, now
+                else:
+                    logger.error("Game loop error (%d): %s (repeat)", self.consecutive_errors, e)
 
                 if self.consecutive_errors >= settings.MAX_CONSECUTIVE_ERRORS:
                     logger.error(
@@ -142,13 +172,13 @@ class GameLoop:
     def _tick(self):
         """Single iteration of the game loop. LLM decides EVERY action."""
         self.loop_count += 1
-        tick_start = time.time()
+        tick_start = time.monotonic_ns()
 
-        # 1. Read game memory from Lua-written JSON
-        game_state = GameState.read()
+        # 1. Read game memory from Lua-written JSON (parsed by the watcher)
+        game_state = self.state_watcher.latest
 
         # If Lua script hasn't written game_state.json yet, wait
-        if not settings.GAME_STATE_FILE.exists():
+        if not self.state_watcher.exists:
             if self.loop_count % 5 == 1:
                 logger.info(
                     "Waiting for Lua script... "
@@ -164,31 +194,38 @@ class GameLoop:
         if battle_events.get("battle_end") == "won":
             self.stats.battles_won += 1
 
-        # 4. Capture screenshot
-        screenshot_b64, screenshot_img = self.screen.capture_base64()
-
-        # 5. Get current goal context
+        # 4. Get current goal context
         goal_context = self.planner.get_active_goal_context()
 
-        # 6. Query relevant memories
+        # 5. Query relevant memories in the background
         memory_query = f"{game_state.map_name} {goal_context}"
-        memory_context = self.memory.get_context_for_situation(memory_query)
+        memory_future = self._mem_exec.submit(
+            self.memory.get_context_for_situation, memory_query
+        )
+
+        # 6. Capture screenshot
+        screenshot_b64, screenshot_img = self.screen.get_latest_base64()
 
         # 7. Build extra context
         extra_context = self._build_extra_context(game_state)
 
-        # 8. Get recent actions text
-        recent_actions_text = self.vision.get_recent_actions_text()
-
-        # 9. Send to LLM - it decides everything
-        analysis = self.vision.analyze(
-            screenshot_b64=screenshot_b64,
-            game_state_text=game_state.get_party_summary(),
-            current_goal=goal_context,
-            memories=memory_context,
-            recent_actions=recent_actions_text,
-            extra_context=extra_context,
+        # 8-9. Build the prompt and send to LLM - it decides everything
+        #      (unless this exact situation was decided moments ago)
+        cache_key = self._analysis_cache_key(
+            screenshot_img, game_state, goal_context, extra_context,
         )
+        analysis = self._cached_analysis(cache_key)
+        cached = analysis is not None
+        if not cached:
+            analysis = self.vision.analyze(
+                screenshot_b64=screenshot_b64,
+                system_prompt=self._build_prompt(
+                    game_state, goal_context, memory_future, extra_context,
+                ),
+            )
+            self._store_analysis(cache_key, analysis)
+        else:
+            self.vision.record_analysis(analysis)
 
         logger.info(
             f"[Tick {self.loop_count}] "
@@ -201,17 +238,14 @@ class GameLoop:
         action = analysis.get("action", "A")
 
         if action in settings.DIRECTION_BUTTONS and not game_state.in_battle:
-            # Direction press in overworld - walk a few steps
-            for _ in range(3):
-                input_handler.press_button(action, hold_seconds=0.12)
-                time.sleep(0.03)
+            # Direction press in overworld - walk a few steps (non-blocking)
+            input_handler.press_sequence_async([action] * 3, hold=0.12, gap=0.03)
         else:
             # Button press (A, B, START, etc.)
             input_handler.execute_action(action)
 
         # Track action
         self.recent_actions.append(action)
-        self.recent_actions = self.recent_actions[-20:]
 
         self.stats.log_action(
             self.loop_count,
@@ -222,20 +256,34 @@ class GameLoop:
 
         # Update overlay
         if self.overlay:
-            hp_text = self._get_hp_text(game_state)
-            self.overlay.update({
-                "tick": self.loop_count,
-                "game_phase": analysis.get("game_phase", "?"),
-                "observation": analysis.get("observation", ""),
-                "reasoning": analysis.get("reasoning", ""),
-                "action": analysis.get("action", ""),
-                "action_detail": analysis.get("action_detail", ""),
-                "next_plan": analysis.get("next_plan", ""),
-                "hp_status": hp_text,
-            })
-
-        # 14. Save memory if LLM suggests one
-        save_memory = analysis.get("save_memory")
+            hp_name, hp_cur, hp_max = self._get_lead_hp(game_state)
+            overlay_key = (
+                analysis.get("game_phase"),
+                analysis.get("observation"),
+                analysis.get("reasoning"),
+                analysis.get("action"),
+                analysis.get("action_detail"),
+                analysis.get("next_plan"),
+                hp_name, hp_cur, hp_max,
+                self.loop_count // UNCHANGED_REFRESH_TICKS,
+            )
+            if overlay_key != self._last_overlay_key:
+                self._last_overlay_key = overlay_key
+                self.overlay.update({
+                    "tick": self.loop_count,
+                    "game_phase": analysis.get("game_phase", "?"),
+                    "observation": analysis.get("observation", ""),
+                    "reasoning": analysis.get("reasoning", ""),
+                    "action": analysis.get("action", ""),
+                    "action_detail": analysis.get("action_detail", ""),
+                    "next_plan": analysis.get("next_plan", ""),
+                    "hp_name": hp_name,
+                    "hp_cur": hp_cur,
+                    "hp_max": hp_max,
+                })
+
+        # 14. Save memory if LLM suggests one (a reused decision was already saved)
+        save_memory = None if cached else analysis.get("save_memory")
         if save_memory and save_memory != "null" and save_memory.strip():
             self.memory.add(
                 save_memory,
@@ -246,9 +294,8 @@ class GameLoop:
                     "tick": self.loop_count,
                 },
             )
-
-        # 15. Process goal updates
-        goal_update = analysis.get("goal_update")
+        # 15. Process goal updates (likewise only for fresh decisions)
+        goal_update = None if cached else analysis.get("goal_update")
         current_goal = self.planner.get_current_goal()
         if goal_update and current_goal and goal_update != "null":
             if "complete" in str(goal_update).lower():
@@ -260,7 +307,18 @@ class GameLoop:
 
         # 16. Push to dashboard
         if self.loop_count % settings.DB_UPDATE_INTERVAL == 0:
-            self._push_dashboard(game_state, analysis, tick_start, screenshot_b64)
+            feed_key = (
+                analysis.get("game_phase"),
+                analysis.get("observation"),
+                analysis.get("action"),
+                game_state,
+                screenshot_b64,
+                self.loop_count // (settings.DB_UPDATE_INTERVAL * UNCHANGED_REFRESH_TICKS),
+            )
+            if feed_key != self._last_feed_key:
+                self._last_feed_key = feed_key
+                screenshot_jpeg = self.screen.jpeg_bytes(screenshot_b64) if screenshot_b64 else None
+                self._push_dashboard(game_state, analysis, tick_start, screenshot_jpeg)
 
         # 17. Periodic session update
         if self.session_id and self.loop_count % 10 == 0:
@@ -272,21 +330,71 @@ class GameLoop:
                 whiteouts=self.stats.whiteouts,
             )
 
-        tick_duration = time.time() - tick_start
+        tick_duration = (time.monotonic_ns() - tick_start) / 1e9
         logger.debug(
             f"Tick {self.loop_count} completed in {tick_duration:.2f}s | "
             f"Memories: {self.memory.total_memories}"
         )
 
-    def _get_hp_text(self, game_state):
-        """Format lead Pokemon HP for overlay."""
+    def _build_prompt(self, game_state, goal_context, memory_future, extra_context):
+        """Render the LLM system prompt in one pass (only on a cache miss)."""
+        return build_system_prompt(
+            game_state_text=game_state.get_party_summary(),
+            current_goal=goal_context,
+            memories=memory_future.result(),
+            recent_actions=self.vision.get_recent_actions_text(),
+            extra_context=extra_context,
+        )
+
+    def _analysis_cache_key(self, screenshot_img, game_state, goal_context, extra_context):
+        """
+        Key a decision by what the LLM would see: exact frame, position, HP,
+        goal and warnings. None (never cached) while in battle.
+        """
+        if game_state.in_battle:
+            return None
+        party_hp = tuple(
+            4 * c // (m or 1) for c, m in zip(game_state.hp_cur, game_state.hp_max)
+        )
+        return (
+            ScreenCapture.frame_crc(screenshot_img),
+            game_state.map_id,
+            game_state.player_x,
+            game_state.player_y,
+            party_hp,
+            goal_context,
+            extra_context,
+        )
+
+    def _cached_analysis(self, key):
+        """Return a still-valid cached analysis for *key*, or None."""
+        if key is None:
+            return None
+        entry = self._analysis_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, analysis = entry
+        if time.monotonic() > expires_at:
+            del self._analysis_cache[key]
+            return None
+        self._analysis_cache.move_to_end(key)
+        return analysis
+
+    def _store_analysis(self, key, analysis):
+        """Cache a fresh analysis (LRU, bounded by VISION_CACHE_SIZE)."""
+        if key is None or analysis.get("game_phase") in UNCACHED_PHASES:
+            return  # battle/dialogue/menu, or a fallback / unparseable response
+        self._analysis_cache[key] = (time.monotonic() + settings.VISION_CACHE_TTL, analysis)
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > settings.VISION_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _get_lead_hp(self, game_state):
+        """Lead Pokemon (name, current HP, max HP) for the overlay."""
         if not game_state.party:
-            return "--"
+            return "--", 0, 1
         lead = game_state.party[0]
-        name = lead.get("species_name", "?")
-        hp_c = lead.get("hp_current", 0)
-        hp_m = lead.get("hp_max", 1)
-        return f"{name}: {hp_c}/{hp_m}"
+        return lead.species_name, lead.hp_current, lead.hp_max
 
     def _build_extra_context(self, game_state):
         """Build additional context for the LLM based on current state."""
@@ -297,31 +405,24 @@ class GameLoop:
             parts.append(self.battle.get_battle_context(game_state))
 
         # Critical HP warning
-        if game_state.party:
-            lead = game_state.party[0]
-            lead_hp = lead.get("hp_current", 0)
-            lead_max = lead.get("hp_max", 1)
-            lead_name = lead.get("species_name", "Pokemon")
-            lead_pct = (lead_hp / lead_max * 100) if lead_max > 0 else 0
-
-            if lead_hp == 0 and not self.battle.in_battle:
-                parts.append(
-                    f"\nCRITICAL: {lead_name} has FAINTED! "
-                    "Open menu (START) and switch to a healthy Pokemon, "
-                    "then go to the nearest Pokemon Center!"
-                )
-            elif 0 < lead_pct < 25:
-                parts.append(
-                    f"\nCRITICAL HP WARNING: {lead_name} is at "
-                    f"{lead_hp}/{lead_max} HP ({lead_pct:.0f}%)! "
-                    "STOP fighting and go to a Pokemon Center NOW! "
-                    "Avoid tall grass and trainers!"
-                )
-
-            all_low = all(
-                (p.get("hp_current", 0) / max(p.get("hp_max", 1), 1)) < 0.25
-                for p in game_state.party
-            )
+        hp_cur = game_state.hp_cur
+        hp_max = game_state.hp_max
+        if hp_cur:
+            lead_hp = hp_cur[0]
+            lead_max = hp_max[0]
+            # 0 = fainted, 1 = under 25% (needs a known max HP), 2 = fine
+            bucket = 0 if lead_hp == 0 else 1 if 0 < 4 * lead_hp < lead_max else 2
+            template = _LEAD_HP_WARNINGS[self.battle.in_battle][bucket]
+            if template:
+                parts.append(template.format(
+                    name=game_state.party[0].species_name,
+                    hp=lead_hp,
+                    mx=lead_max,
+                    pct=lead_hp / lead_max * 100,
+                ))
+
+            # cur/max < 0.25, kept in integers
+            all_low = all(4 * c < (m or 1) for c, m in zip(hp_cur, hp_max))
             if all_low:
                 parts.append(
                     "\nEMERGENCY: ALL POKEMON ARE LOW HP! "
@@ -331,7 +432,8 @@ class GameLoop:
 
         # Navigation hints based on current map (no coord-based directions - those are unreliable)
         if not self.battle.in_battle:
-            info = _MAP_INFO.get(game_state.map_id)
+            map_id = game_state.map_id
+            info = _MAP_INFO[map_id] if 0 <= map_id < len(_MAP_INFO) else None
             if info:
                 parts.append(f"\nNAVIGATION: {info}")
 
@@ -362,11 +464,12 @@ class GameLoop:
                 )
 
         # Repeated action detection
-        if len(self.recent_actions) >= 4:
-            last_4 = self.recent_actions[-4:]
-            if len(set(last_4)) == 1:
+        recent = self.recent_actions
+        if len(recent) >= 4:
+            last = recent[-1]
+            if recent[-2] == last and recent[-3] == last and recent[-4] == last:
                 parts.append(
-                    f"\nSTOP pressing {last_4[0]}! It is not working. "
+                    f"\nSTOP pressing {last}! It is not working. "
                     "You are blocked. Press a DIFFERENT direction."
                 )
 
@@ -382,14 +485,14 @@ class GameLoop:
 
         return "\n".join(parts) if parts else ""
 
-    def _push_dashboard(self, game_state, analysis, tick_start, screenshot_b64=None):
+    def _push_dashboard(self, game_state, analysis, tick_start, screenshot_jpeg=None):
         """Push current state to PostgreSQL for the live dashboard."""
         try:
-            latency_ms = int((time.time() - tick_start) * 1000)
+            latency_ms = (time.monotonic_ns() - tick_start) // 1_000_000
 
             feed_data = {
                 "tick": self.loop_count,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp_ms": time.time_ns() // 1_000_000,  # UTC epoch ms
                 "latency_ms": latency_ms,
                 "model": settings.MODEL,
                 "game_phase": analysis.get("game_phase", "unknown"),
@@ -407,17 +510,14 @@ class GameLoop:
                 "goals": self.planner.get_goals_snapshot(),
             }
 
-            if screenshot_b64:
-                feed_data["screenshot"] = screenshot_b64
-
-            push_live_feed(feed_data)
+            queue_live_feed(feed_data, screenshot_jpeg)
         except Exception as e:
             logger.debug(f"Failed to push dashboard: {e}")
 
     def _uptime(self):
-        if not self.start_time:
+        if not self.start_time_ns:
             return "0s"
-        elapsed = int(time.time() - self.start_time)
+        elapsed = (time.monotonic_ns() - self.start_time_ns) // 1_000_000_000
         hours, remainder = divmod(elapsed, 3600)
         minutes, seconds = divmod(remainder, 60)
         return f"{hours}h {minutes}m {seconds}s"
@@ -430,6 +530,7 @@ class GameLoop:
             MemoryType.GENERAL,
             metadata={"event": "shutdown", "ticks": self.loop_count},
         )
+        self.memory.flush()
 
         if self.session_id:
             end_session(
@@ -440,6 +541,11 @@ class GameLoop:
                 whiteouts=self.stats.whiteouts,
             )
 
+        self.screen.stop_async()
+        input_handler.wait_idle()
+        self.state_watcher.stop()
+        self._mem_exec.shutdown(wait=True)
+
         if self.overlay:
             self.overlay.shutdown()
 
@@ -447,9 +553,26 @@ class GameLoop:
         logger.info("Goodbye!")
 
 
+# Lead Pokemon HP warnings, indexed [in_battle][bucket] (see _build_extra_context)
+_FAINTED_MSG = (
+    "\nCRITICAL: {name} has FAINTED! "
+    "Open menu (START) and switch to a healthy Pokemon, "
+    "then go to the nearest Pokemon Center!"
+)
+_CRITICAL_HP_MSG = (
+    "\nCRITICAL HP WARNING: {name} is at "
+    "{hp}/{mx} HP ({pct:.0f}%)! "
+    "STOP fighting and go to a Pokemon Center NOW! "
+    "Avoid tall grass and trainers!"
+)
+_LEAD_HP_WARNINGS = (
+    (_FAINTED_MSG, _CRITICAL_HP_MSG, ""),  # overworld
+    ("", _CRITICAL_HP_MSG, ""),            # in battle
+)
+
 # ── Map info for navigation context ─────────────
 
-_MAP_INFO = {
+_MAP_HINTS = {
     0: "Pallet Town. NO Pokemon Center. Go UP to Route 1 to reach Viridian City.",
     1: "Viridian City. Route 1 is SOUTH, Viridian Forest is NORTH.",
     2: "Pewter City. Brock's Gym is upper area. Route 3 is EAST.",
@@ -470,3 +593,6 @@ _MAP_INFO = {
     24: "Route 24 (Nugget Bridge). Goes NORTH from Cerulean City.",
     25: "Route 25. Bill's house is at the far EAST end.",
 }
+
+# Navigation hints indexed directly by map_id (None where there is no hint)
+_MAP_INFO = [_MAP_HINTS.get(i) for i in range(max(_MAP_HINTS) + 1)]
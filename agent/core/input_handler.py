@@ -1,10 +1,16 @@
 """
 Keyboard input handler for mGBA emulator.
-Sends button presses via pydirectinput (DirectInput scan codes).
+Sends button presses as DirectInput scan codes through user32.SendInput
+(scan codes from pydirectinput's mapping).
 Pokemon has 8 buttons: A, B, Start, Select, Up, Down, Left, Right.
 """
 
+import ctypes
+import ctypes.wintypes
+import functools
 import logging
+import queue
+import threading
 import time
 
 import pydirectinput
@@ -13,8 +19,143 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
-pydirectinput.FAILSAFE = False
-pydirectinput.PAUSE = 0.02
+# Lookup tables built once at import: button -> key, button -> default hold
+_KEYS = settings.BUTTON_MAP
+_DIRS = settings.DIRECTION_BUTTONS
+_HOLD = {b: (0.3 if b in _DIRS else 0.1) for b in _KEYS}
+
+# ── Raw SendInput ────────────────────────────────────────────
+# Same events pydirectinput generates, minus its per-call PAUSE and lookups.
+
+user32 = ctypes.windll.user32
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+VK_NUMLOCK = 0x90
+# With NumLock on, arrows also need this prefix scan code or the game sees
+# numpad keys (as pydirectinput does: before the down, after the up)
+SCAN_EXTENDED_PREFIX = 0xE0
+_ARROWS = frozenset(("up", "down", "left", "right"))
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.wintypes.WORD),
+        ("wScan", ctypes.wintypes.WORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.wintypes.LONG),
+        ("dy", ctypes.wintypes.LONG),
+        ("mouseData", ctypes.wintypes.DWORD),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("time", ctypes.wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+# key name -> (scan code, flags); arrow keys are extended keys
+_SCAN = {
+    key: (
+        pydirectinput.KEYBOARD_MAPPING[key],
+        KEYEVENTF_SCANCODE
+        | (KEYEVENTF_EXTENDEDKEY if key in _ARROWS else 0),
+    )
+    for key in _KEYS.values()
+    if pydirectinput.KEYBOARD_MAPPING.get(key)
+}
+
+
+def _send_keys(events):
+    """Submit [(key, is_up), ...] to the OS in a single SendInput call."""
+    numlock = None  # queried lazily, only when an arrow key is sent
+    strokes = []    # (scan code, flags)
+    for key, is_up in events:
+        scan, flags = _SCAN[key]
+        up = KEYEVENTF_KEYUP if is_up else 0
+        prefix = False
+        if key in _ARROWS:
+            if numlock is None:
+                numlock = bool(user32.GetKeyState(VK_NUMLOCK))
+            prefix = numlock
+        if prefix and not is_up:
+            strokes.append((SCAN_EXTENDED_PREFIX, KEYEVENTF_SCANCODE))
+        strokes.append((scan, flags | up))
+        if prefix and is_up:
+            strokes.append((SCAN_EXTENDED_PREFIX, KEYEVENTF_SCANCODE | up))
+
+    inputs = (_INPUT * len(strokes))()
+    for slot, (scan, flags) in zip(inputs, strokes):
+        slot.type = INPUT_KEYBOARD
+        slot.u.ki.wScan = scan
+        slot.u.ki.dwFlags = flags
+    sent = user32.SendInput(len(strokes), inputs, ctypes.sizeof(_INPUT))
+    if sent != len(strokes):
+        raise OSError(f"SendInput inserted {sent}/{len(strokes)} events")
+
+
+def _normalize(button):
+    """Canonical button name; skips the string copies when already canonical."""
+    if button in _KEYS:
+        return button
+    return button.upper().strip()
+
+
+# Presses queued by press_sequence_async: (button, hold_seconds, gap_seconds)
+_input_q = queue.Queue()
+_input_thread = None
+_input_thread_lock = threading.Lock()
+
+
+def _input_worker():
+    while True:
+        button, hold, gap = _input_q.get()
+        try:
+            _press(button, hold)
+            if gap:
+                time.sleep(gap)
+        finally:
+            _input_q.task_done()
+
+
+def _ensure_worker():
+    global _input_thread
+    with _input_thread_lock:
+        if _input_thread is None:
+            _input_thread = threading.Thread(
+                target=_input_worker, name="input-worker", daemon=True
+            )
+            _input_thread.start()
+
+
+def press_sequence_async(buttons, hold=0.12, gap=0.03):
+    """
+    Queue buttons to be pressed on the input thread and return immediately,
+    so the caller can start the next screenshot/LLM call while keys are held.
+    """
+    _ensure_worker()
+    for button in buttons:
+        _input_q.put((_normalize(button), hold, gap))
+
+
+def wait_idle():
+    """Block until every queued async press has been released."""
+    _input_q.join()
 
 
 def press_button(button, hold_seconds=0.1):
@@ -22,16 +163,21 @@ def press_button(button, hold_seconds=0.1):
     Press a single GBA button.
     Maps button name (A, B, START, etc.) to keyboard key via BUTTON_MAP.
     """
-    button = button.upper().strip()
-    key = settings.BUTTON_MAP.get(button)
+    # Keep presses in order with anything still queued by press_sequence_async
+    wait_idle()
+    return _press(_normalize(button), hold_seconds)
+
+
+def _press(button, hold_seconds):
+    key = _KEYS.get(button)
     if not key:
         logger.warning(f"Unknown button: {button}")
         return False
 
     try:
-        pydirectinput.keyDown(key)
+        _send_keys(((key, False),))
         time.sleep(hold_seconds)
-        pydirectinput.keyUp(key)
+        _send_keys(((key, True),))
         logger.debug(f"Pressed {button} ({key}) for {hold_seconds}s")
         return True
     except Exception as e:
@@ -51,37 +197,39 @@ def press_sequence(buttons, delay=0.15):
     """
     results = []
     for button in buttons:
-        if button.upper() == "WAIT":
+        button = _normalize(button)
+        if button == "WAIT":
             time.sleep(delay * 3)
             results.append(True)
             continue
 
-        is_direction = button.upper() in settings.DIRECTION_BUTTONS
-        hold = 0.3 if is_direction else 0.1
-        result = press_button(button, hold_seconds=hold)
+        result = press_button(button, hold_seconds=_HOLD.get(button, 0.1))
         results.append(result)
         time.sleep(delay)
 
     return results
 
 
+def _wait():
+    time.sleep(0.5)
+    logger.debug("Waited 0.5s")
+    return True
+
+
+# Action name -> zero-argument handler with its key and hold time baked in
+_HANDLERS = {b: functools.partial(press_button, b, hold) for b, hold in _HOLD.items()}
+_HANDLERS["WAIT"] = _wait
+
+
 def execute_action(action):
     """
     Execute a single action returned by the LLM.
     action: string like "A", "UP", "DOWN", "START", "WAIT", etc.
     Returns True on success.
     """
-    action = action.upper().strip()
-
-    if action == "WAIT":
-        time.sleep(0.5)
-        logger.debug("Waited 0.5s")
-        return True
-
-    if action in settings.BUTTON_MAP:
-        is_direction = action in settings.DIRECTION_BUTTONS
-        hold = 0.3 if is_direction else 0.1
-        return press_button(action, hold_seconds=hold)
+    handler = _HANDLERS.get(action) or _HANDLERS.get(action.upper().strip())
+    if handler is not None:
+        return handler()
 
     logger.warning(f"Unknown action: {action}")
     return False
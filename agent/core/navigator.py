@@ -19,6 +19,21 @@ class Navigator:
 
     def __init__(self):
         self.warp_data = self._load_warp_data()
+        # Keyed by int map ID (as read from game state) so lookups don't
+        # have to format str(map_id) first; callers passing str IDs are
+        # normalised with int() at the public entry points
+        self._by_map = {int(k): v for k, v in self.warp_data.items()}
+        self._target_keys = {
+            map_id: tuple(m.get("landmarks", {})) for map_id, m in self._by_map.items()
+        }
+        # The prompt's target list is a pure function of the warp file
+        self._targets_text = {
+            map_id: "\n".join(
+                f"  GOTO_{key.upper()} = walk to {info.get('label', key)}"
+                for key, info in m.get("landmarks", {}).items()
+            )
+            for map_id, m in self._by_map.items()
+        }
         self.target = None       # (x, y) target coordinates
         self.target_label = ""   # human-readable name
         self.target_map = -1     # map the target is on
@@ -37,7 +52,8 @@ class Navigator:
 
     def set_target(self, map_id, landmark_key):
         """Set navigation target by landmark key. Returns True if valid."""
-        map_data = self.warp_data.get(str(map_id))
+        map_id = int(map_id)
+        map_data = self._by_map.get(map_id)
         if not map_data:
             logger.warning(f"No warp data for map {map_id}")
             return False
@@ -188,24 +204,11 @@ class Navigator:
 
     def get_available_targets(self, map_id):
         """Get list of available landmark keys for a map."""
-        map_data = self.warp_data.get(str(map_id))
-        if not map_data:
-            return []
-        return list(map_data.get("landmarks", {}).keys())
+        return list(self._target_keys.get(int(map_id), ()))
 
     def get_targets_text(self, map_id):
         """Format available targets as text for the LLM prompt."""
-        map_data = self.warp_data.get(str(map_id))
-        if not map_data:
-            return ""
-        landmarks = map_data.get("landmarks", {})
-        if not landmarks:
-            return ""
-        parts = []
-        for key, info in landmarks.items():
-            goto_cmd = f"GOTO_{key.upper()}"
-            parts.append(f"  {goto_cmd} = walk to {info.get('label', key)}")
-        return "\n".join(parts)
+        return self._targets_text.get(int(map_id), "")
 
     def _load_warp_data(self):
         """Load warp coordinate database."""
@@ -5,19 +5,19 @@ Unlike ClaudeScape's text-parsing approach, this uses ground-truth RAM data.
 """
 
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStats:
     """Cumulative player statistics derived from game memory comparisons."""
 
     # Movement
     steps_taken: int = 0
-    _prev_x: int = -1
-    _prev_y: int = -1
+    _prev_xy: tuple = None  # (x, y) last tick; None until the first update
 
     # Pokemon
     pokemon_caught: int = 0
@@ -42,19 +42,18 @@ class PlayerStats:
     # Time
     total_ticks: int = 0
 
-    # Action log for dashboard (last 30)
-    action_history: list = field(default_factory=list)
+    # Action log for dashboard (last 30), as (tick, action, observation, phase)
+    action_history: deque = field(default_factory=lambda: deque(maxlen=30))
 
     def update(self, game_state):
         """Update stats by comparing current game state to previous values."""
         self.total_ticks += 1
 
         # Detect movement (steps)
-        if self._prev_x >= 0 and self._prev_y >= 0:
-            if game_state.player_x != self._prev_x or game_state.player_y != self._prev_y:
-                self.steps_taken += 1
-        self._prev_x = game_state.player_x
-        self._prev_y = game_state.player_y
+        xy = (game_state.player_x, game_state.player_y)
+        if xy != self._prev_xy and self._prev_xy is not None:
+            self.steps_taken += 1
+        self._prev_xy = xy
 
         # Detect new Pokemon caught
         if game_state.pokedex_caught > self._prev_pokedex_caught:
@@ -66,11 +65,10 @@ class PlayerStats:
         self.pokedex_caught = game_state.pokedex_caught
 
         # Track highest level
-        for pkmn in game_state.party:
-            level = pkmn.get("level", 0)
-            if level > self.highest_level:
-                self.highest_level = level
-                logger.info(f"New highest level: {level}")
+        level = max([pkmn.level for pkmn in game_state.party], default=0)
+        if level > self.highest_level:
+            self.highest_level = level
+            logger.info(f"New highest level: {level}")
 
         # Detect badge earned
         if game_state.badge_count > self._prev_badges:
@@ -80,10 +78,8 @@ class PlayerStats:
         self._prev_badges = game_state.badge_count
 
         # Detect whiteout (all party HP=0 and money decreased)
-        if game_state.party:
-            all_fainted = all(
-                p.get("hp_current", 0) == 0 for p in game_state.party
-            )
+        if game_state.hp_cur:
+            all_fainted = not any(game_state.hp_cur)
             money_decreased = game_state.money < self._prev_money and self._prev_money > 0
             if all_fainted and money_decreased:
                 self.whiteouts += 1
@@ -92,15 +88,7 @@ class PlayerStats:
 
     def log_action(self, tick, action, observation, game_phase):
         """Record an action for the dashboard timeline."""
-        self.action_history.append({
-            "tick": tick,
-            "action": action,
-            "observation": observation[:120],
-            "phase": game_phase,
-        })
-        # Keep last 30
-        if len(self.action_history) > 30:
-            self.action_history = self.action_history[-30:]
+        self.action_history.append((tick, action, observation[:120], game_phase))
 
     def to_dict(self):
         """Serialize for the live dashboard."""
@@ -114,5 +102,8 @@ class PlayerStats:
             "pokedex_seen": self.pokedex_seen,
             "pokedex_caught": self.pokedex_caught,
             "total_ticks": self.total_ticks,
-            "action_history": self.action_history[-30:],
+            "action_history": [
+                {"tick": t, "action": a, "observation": o, "phase": p}
+                for t, a, o, p in self.action_history
+            ],
         }
@@ -8,10 +8,19 @@ import ctypes
 import ctypes.wintypes
 import io
 import logging
+import threading
+import zlib
 
 import mss
 from PIL import Image
 
+try:
+    import numpy
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    _turbo = TurboJPEG()  # raises if the libjpeg-turbo shared library is missing
+except (ImportError, OSError, RuntimeError):  # optional speedup; PIL encodes without it
+    _turbo = None
+
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,6 +28,11 @@ logger = logging.getLogger(__name__)
 user32 = ctypes.windll.user32
 
 
+# The emulator window rarely moves; its client rect (GetClientRect +
+# ClientToScreen) is re-queried only every this many captures (or right away
+# if a grab fails)
+RECT_REFRESH_FRAMES = 30
+
 WNDENUMPROC = ctypes.WINFUNCTYPE(ctypes.wintypes.BOOL, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
 
 
@@ -28,8 +42,26 @@ class ScreenCapture:
     def __init__(self):
         self.hwnd = None
         self.sct = mss.mss()
+        self._rect = None
+        self._rect_age = 0
+        self._monitor = None       # mss region dict, rebuilt only when the rect changes
+        self._monitor_rect = None
+        self._debug_saved = False
         self._find_window()
 
+        # Background capture: latest (b64, img) frame, refreshed by _capture_loop
+        self._latest = None
+        self._frame_lock = threading.Lock()
+        self._capture_stop = threading.Event()
+        self._capture_thread = None
+
+        # Encode cache: static frames (menus, dialogue) reuse the last JPEG
+        self._last_frame_crc = None
+        self._last_b64 = None
+        self._last_jpeg = None
+        # Reused JPEG output buffer, one per capturing thread
+        self._jpeg_bufs = threading.local()
+
     def _find_window(self):
         """Find the mGBA main window (largest one with 'mGBA' in title)."""
         # Enumerate all windows containing "mGBA" and pick the largest
@@ -62,28 +94,50 @@ class ScreenCapture:
             )
 
     def get_window_rect(self):
-        """Get the mGBA window bounding box."""
+        """
+        Get the mGBA client-area bounding box in screen coordinates (cached
+        for RECT_REFRESH_FRAMES calls). Title bar and borders are left out so
+        fewer pixels are grabbed and scaled for nothing.
+        """
+        if self._rect is not None and self._rect_age < RECT_REFRESH_FRAMES:
+            self._rect_age += 1
+            return self._rect
+
+        # Only rescan all windows once the emulator window is actually gone
+        if self.hwnd and not user32.IsWindow(self.hwnd):
+            self.hwnd = None
         if not self.hwnd:
             self._find_window()
         if not self.hwnd:
+            self._rect = None
             return None
 
         rect = ctypes.wintypes.RECT()
-        user32.GetWindowRect(self.hwnd, ctypes.byref(rect))
-        return (rect.left, rect.top, rect.right, rect.bottom)
+        origin = ctypes.wintypes.POINT(0, 0)
+        if not (user32.GetClientRect(self.hwnd, ctypes.byref(rect))
+                and user32.ClientToScreen(self.hwnd, ctypes.byref(origin))):
+            self.hwnd = self._rect = None
+            return None
+        self._rect = (origin.x, origin.y, origin.x + rect.right, origin.y + rect.bottom)
+        self._rect_age = 0
+        return self._rect
 
-    def capture(self):
+    def capture(self, sct=None):
         """
         Capture a screenshot of the mGBA window.
         Returns a PIL Image resized to SCREENSHOT_WIDTH x SCREENSHOT_HEIGHT.
+        *sct* overrides the mss instance (mss handles are bound to their thread).
         """
+        sct = sct or self.sct
         rect = self.get_window_rect()
         if not rect:
             logger.warning("No window rect available, capturing full screen")
-            monitor = self.sct.monitors[1]
+            monitor = sct.monitors[1]
+        elif rect == self._monitor_rect:
+            monitor = self._monitor
         else:
             left, top, right, bottom = rect
-            # Clamp to positive values (Windows invisible borders)
+            # Clamp to positive values (window dragged partly off-screen)
             left = max(0, left)
             top = max(0, top)
             monitor = {
@@ -92,34 +146,131 @@ class ScreenCapture:
                 "width": right - left,
                 "height": bottom - top,
             }
+            self._monitor, self._monitor_rect = monitor, rect
+            logger.debug("Capture region: %s", monitor)
 
-        logger.debug(f"Capture region: {monitor}")
-        screenshot = self.sct.grab(monitor)
-        img = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
+        try:
+            screenshot = sct.grab(monitor)
+        except Exception:
+            self._rect = None  # window moved/closed; re-query next frame
+            raise
+        # Decode mss's raw BGRA buffer in PIL's C unpacker; screenshot.rgb
+        # would first build a reordered copy of the frame in Python
+        img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
 
-        # Save first capture for debugging
-        if not hasattr(self, '_debug_saved'):
-            debug_path = settings.PROJECT_ROOT / "data" / "debug_capture.png"
-            img.save(str(debug_path))
-            logger.info(f"Debug screenshot saved to {debug_path} (size: {img.size})")
+        # Save first capture for debugging (off-thread: PNG encode + disk write)
+        if not self._debug_saved:
             self._debug_saved = True
+            threading.Thread(
+                target=self._save_debug, args=(img,), daemon=True, name="DebugCapture",
+            ).start()
 
-        # Resize to target dimensions
-        img = img.resize(
-            (settings.SCREENSHOT_WIDTH, settings.SCREENSHOT_HEIGHT),
-            Image.LANCZOS,
-        )
+        # Resize to target dimensions. This is always a downscale, where a box
+        # filter looks the same to the model as Lanczos at a fraction of the
+        # cost; reducing_gap does most of it with an integer reduce first.
+        size = (settings.SCREENSHOT_WIDTH, settings.SCREENSHOT_HEIGHT)
+        if img.size != size:
+            img = img.resize(size, Image.BOX, reducing_gap=2.0)
 
         return img
 
-    def capture_base64(self):
-        """Capture screenshot and return as JPEG base64 string."""
-        img = self.capture()
-        buffer = io.BytesIO()
-        img.save(buffer, format="JPEG", quality=settings.JPEG_QUALITY)
-        b64 = base64.b64encode(buffer.getvalue()).decode("ascii")
+    @staticmethod
+    def _save_debug(img):
+        debug_path = settings.PROJECT_ROOT / "data" / "debug_capture.png"
+        try:
+            img.save(str(debug_path))
+            logger.info(f"Debug screenshot saved to {debug_path} (size: {img.size})")
+        except OSError as e:
+            logger.debug(f"Debug screenshot save failed: {e}")
+
+    @staticmethod
+    def frame_crc(img):
+        """CRC32 of *img*'s pixels; any visible change (text, cursor) alters it."""
+        return zlib.crc32(img.tobytes())
+
+    def capture_base64(self, sct=None):
+        """
+        Capture screenshot and return as JPEG base64 string.
+        The encode is skipped when the frame's pixels match the previous one.
+        """
+        img = self.capture(sct)
+        crc = self.frame_crc(img)
+        if crc == self._last_frame_crc:
+            return self._last_b64, img
+
+        if _turbo is not None:
+            jpeg = _turbo.encode(
+                numpy.asarray(img), quality=settings.JPEG_QUALITY, pixel_format=TJPF_RGB,
+            )
+        else:
+            buffer = getattr(self._jpeg_bufs, "buf", None)
+            if buffer is None:
+                buffer = self._jpeg_bufs.buf = io.BytesIO()
+            else:
+                buffer.seek(0)
+                buffer.truncate()
+            img.save(buffer, format="JPEG", quality=settings.JPEG_QUALITY)
+            jpeg = buffer.getvalue()
+        b64 = base64.b64encode(jpeg).decode("ascii")
+        self._last_frame_crc, self._last_b64, self._last_jpeg = crc, b64, jpeg
         return b64, img
 
+    def jpeg_bytes(self, b64):
+        """Raw JPEG bytes for a base64 frame returned by capture_base64()."""
+        last_b64, last_jpeg = self._last_b64, self._last_jpeg
+        if b64 is last_b64:
+            return last_jpeg
+        return base64.b64decode(b64)
+
+    # ── Background capture ───────────────────────────────────
+
+    def start_async(self, interval=None):
+        """
+        Start a daemon thread that keeps grabbing and encoding frames so the
+        game loop can take the latest one without waiting on capture.
+        """
+        if self._capture_thread is not None:
+            return
+        if interval is None:
+            interval = settings.CAPTURE_INTERVAL
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(interval,),
+            daemon=True, name="CaptureThread",
+        )
+        self._capture_thread.start()
+        logger.info(f"Background capture started ({interval}s interval)")
+
+    def stop_async(self):
+        """Stop the background capture thread."""
+        if self._capture_thread is None:
+            return
+        self._capture_stop.set()
+        self._capture_thread.join(timeout=2)
+        self._capture_thread = None
+
+    def _capture_loop(self, interval):
+        sct = mss.mss()  # the thread needs its own handle
+        while not self._capture_stop.is_set():
+            try:
+                frame = self.capture_base64(sct)
+                with self._frame_lock:
+                    self._latest = frame
+            except Exception as e:
+                logger.debug(f"Background capture failed: {e}")
+            self._capture_stop.wait(interval)
+
+    def get_latest_base64(self):
+        """
+        Return the most recent (b64, img) frame from the background thread.
+        Falls back to a synchronous capture until the first frame is ready.
+        """
+        with self._frame_lock:
+            latest = self._latest
+        if latest is None:
+            return self.capture_base64()
+        return latest
+
     def bring_to_front(self):
         """Bring the mGBA window to the foreground."""
         if not self.hwnd:
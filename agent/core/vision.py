@@ -5,13 +5,46 @@ Sends screenshots to Gemini 2.0 Flash via OpenRouter and parses action decisions
 
 import json
 import logging
+import random
+import string
+import time
 
-import openai
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Both raise ValueError subclasses on bad input
+_loads = orjson.loads if orjson is not None else json.loads
+
+# raw_decode() parses one JSON value and reports where it ended
+_JSON_DECODER = json.JSONDecoder()
+
+# Reply statuses worth retrying (as the OpenAI SDK did); 5xx is checked separately
+_RETRY_STATUSES = frozenset({408, 409, 429})
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+_VALID_BUTTONS = frozenset({"A", "B", "START", "SELECT", "UP", "DOWN", "LEFT", "RIGHT", "WAIT"})
+
+# Fields the rest of the loop expects in every parsed response
+_RESPONSE_DEFAULTS = {
+    "game_phase": "unknown",
+    "observation": "",
+    "reasoning": "",
+    "action": "A",
+    "action_detail": "",
+    "next_plan": "",
+    "save_memory": None,
+    "goal_update": None,
+}
+
 SYSTEM_PROMPT = """You are an expert Pokemon FireRed player AI. You control the game by choosing ONE button press per turn based on what you see on screen.
 
 Goal: Complete Pokemon FireRed. Beat all 8 gym leaders and the Elite Four.
@@ -83,34 +116,68 @@ Respond in EXACT JSON (no markdown, no code blocks, no extra text):
 {{"game_phase": "overworld|battle|dialogue|menu|title|transition", "observation": "Be SPECIFIC. Describe exactly what you see: name the building, NPCs, Pokemon, items, terrain. Not 'a building' but 'the Pokemon Center in Cerulean City'. Not 'a person' but 'Nurse Joy behind the counter'.", "reasoning": "Explain your thinking like a streamer narrating gameplay. WHY this action? What is your plan? Example: 'My Pokemon are hurt from the battle with Misty, so I need to heal at the nurse counter before heading to Route 5.'", "action": "A|B|START|SELECT|UP|DOWN|LEFT|RIGHT|WAIT", "action_detail": "what this action does", "next_plan": "what to do after this", "save_memory": "important info to remember or null", "goal_update": "complete|fail|progress|null"}}"""
 
 
+def _split_template(template):
+    """Split a str.format template into its literal chunks and field names."""
+    literals, fields = [""], []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        literals[-1] += literal  # parse() has already unescaped {{ and }}
+        if field is not None:
+            fields.append(field)
+            literals.append("")
+    return tuple(literals), tuple(fields)
+
+
+# SYSTEM_PROMPT split once into the literal text around its four fields, so
+# each call is a single join instead of a re-scan of the template by str.format.
+_PROMPT_LITERALS, _PROMPT_FIELDS = _split_template(SYSTEM_PROMPT)
+if _PROMPT_FIELDS != ("game_state", "current_goal", "memories", "recent_actions"):
+    raise RuntimeError(f"build_system_prompt() is out of date with SYSTEM_PROMPT fields {_PROMPT_FIELDS}")
+
+
+def build_system_prompt(game_state_text="", current_goal="", memories="",
+                        recent_actions="", extra_context=""):
+    """Render the full system prompt for one LLM call."""
+    p0, p1, p2, p3, p4 = _PROMPT_LITERALS
+    return "".join((
+        p0, game_state_text or "No game state available",
+        p1, current_goal or "Explore and progress through the game",
+        p2, memories or "No memories yet",
+        p3, recent_actions or "None",
+        p4,
+        "\n\nADDITIONAL CONTEXT:\n" if extra_context else "", extra_context,
+    ))
+
+
 class VisionEngine:
     """Sends screenshots to Gemini 2.0 Flash and parses action decisions."""
 
     def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
+        # Plain HTTP client: we read one field of the reply, so the OpenAI
+        # SDK's request/response model validation is skipped. Kept alive so
+        # successive ticks reuse the same TLS connection.
+        self.client = httpx.Client(
             base_url=settings.OPENROUTER_BASE_URL,
+            headers={"Authorization": f"Bearer {settings.OPENROUTER_API_KEY}"},
+            timeout=settings.LLM_TIMEOUT,
+            # Retries failed connects only; error replies are retried in _post
+            transport=httpx.HTTPTransport(retries=2),
         )
         self.conversation_history = []
         self.max_history = 10
         logger.info("Vision engine initialized (Gemini 2.0 Flash via OpenRouter)")
 
     def analyze(self, screenshot_b64, game_state_text="", current_goal="",
-                memories="", recent_actions="", extra_context=""):
+                memories="", recent_actions="", extra_context="", system_prompt=None):
         """
         Send screenshot to LLM for analysis.
+        Pass a prebuilt *system_prompt* (see build_system_prompt) to skip
+        rendering it from the individual context pieces.
         Returns parsed JSON dict with game_phase, observation, reasoning, action, etc.
         """
-        system = SYSTEM_PROMPT.format(
-            game_state=game_state_text or "No game state available",
-            current_goal=current_goal or "Explore and progress through the game",
-            memories=memories or "No memories yet",
-            recent_actions=recent_actions or "None",
+        system = system_prompt or build_system_prompt(
+            game_state_text, current_goal, memories, recent_actions, extra_context,
         )
 
-        if extra_context:
-            system += f"\n\nADDITIONAL CONTEXT:\n{extra_context}"
-
         user_content = [
             {
                 "type": "image_url",
@@ -125,28 +192,20 @@ class VisionEngine:
         ]
 
         try:
-            response = self.client.chat.completions.create(
-                model=settings.MODEL,
-                max_tokens=settings.LLM_MAX_TOKENS,
-                temperature=settings.LLM_TEMPERATURE,
-                messages=[
+            response = self._post({
+                "model": settings.MODEL,
+                "max_tokens": settings.LLM_MAX_TOKENS,
+                "temperature": settings.LLM_TEMPERATURE,
+                "messages": [
                     {"role": "system", "content": system},
                     {"role": "user", "content": user_content},
                 ],
-            )
-
-            raw = response.choices[0].message.content
-            parsed = self._parse_response(raw)
-
-            # Track history
-            self.conversation_history.append({
-                "observation": parsed.get("observation", "")[:100],
-                "action": parsed.get("action", ""),
-                "phase": parsed.get("game_phase", ""),
             })
-            if len(self.conversation_history) > self.max_history:
-                self.conversation_history = self.conversation_history[-self.max_history:]
+            response.raise_for_status()
 
+            raw = _loads(response.content)["choices"][0]["message"]["content"]
+            parsed = self._parse_response(raw)
+            self.record_analysis(parsed)
             return parsed
 
         except Exception as e:
@@ -162,60 +221,81 @@ class VisionEngine:
                 "goal_update": None,
             }
 
+    def _post(self, payload):
+        """
+        POST a chat completion, retrying rate limits (429), 408/409 and 5xx
+        replies up to LLM_MAX_RETRIES times with jittered exponential backoff,
+        honouring a short Retry-After.
+        """
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            response = self.client.post("/chat/completions", json=payload)
+            status = response.status_code
+            if attempt == settings.LLM_MAX_RETRIES or not (
+                status in _RETRY_STATUSES or status >= 500
+            ):
+                return response
+            delay = min(_RETRY_BASE_DELAY * 2 ** attempt, _RETRY_MAX_DELAY)
+            delay *= 1 - 0.25 * random.random()
+            try:
+                retry_after = float(response.headers.get("retry-after", ""))
+                if 0 < retry_after <= 60:
+                    delay = retry_after
+            except ValueError:
+                pass
+            logger.warning(f"OpenRouter returned {status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def record_analysis(self, parsed):
+        """Add a decision to the recent-action history shown to the LLM."""
+        self.conversation_history.append({
+            "observation": parsed.get("observation", "")[:100],
+            "action": parsed.get("action", ""),
+            "phase": parsed.get("game_phase", ""),
+        })
+        if len(self.conversation_history) > self.max_history:
+            self.conversation_history = self.conversation_history[-self.max_history:]
+
     def _parse_response(self, response):
         """Parse LLM response into structured dict. Handles code block wrapping."""
         response = response.strip()
 
-        # Strip markdown code blocks (Gemini sometimes wraps in ```)
-        if "```json" in response:
-            try:
-                start = response.index("```json") + 7
-                end = response.index("```", start)
-                response = response[start:end].strip()
-            except ValueError:
-                response = response.split("```json", 1)[1].strip().rstrip("`")
-        elif "```" in response:
-            try:
-                start = response.index("```") + 3
-                end = response.index("```", start)
-                response = response[start:end].strip()
-            except ValueError:
-                response = response.split("```", 1)[1].strip().rstrip("`")
-
+        # Most replies are bare JSON; only scan for wrapping when that fails
         try:
-            data = json.loads(response)
-        except json.JSONDecodeError:
-            # Try to find JSON object in the response
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                try:
-                    data = json.loads(response[start:end])
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse LLM response: {response[:150]}")
-                    data = self._fallback_response(response)
-            else:
-                data = self._fallback_response(response)
+            data = _loads(response)
+        except ValueError:
+            data = self._parse_wrapped(response)
 
         # Ensure required fields
-        data.setdefault("game_phase", "unknown")
-        data.setdefault("observation", "")
-        data.setdefault("reasoning", "")
-        data.setdefault("action", "A")
-        data.setdefault("action_detail", "")
-        data.setdefault("next_plan", "")
-        data.setdefault("save_memory", None)
-        data.setdefault("goal_update", None)
+        data = {**_RESPONSE_DEFAULTS, **data}
 
         # Validate action
         data["action"] = data["action"].upper()
-        valid_buttons = {"A", "B", "START", "SELECT", "UP", "DOWN", "LEFT", "RIGHT", "WAIT"}
-        if data["action"] not in valid_buttons:
+        if data["action"] not in _VALID_BUTTONS:
             logger.warning(f"Invalid action '{data['action']}', defaulting to A")
             data["action"] = "A"
 
         return data
 
+    def _parse_wrapped(self, response):
+        """Pull the JSON object out of a reply wrapped in a code block or prose."""
+        # Decode from each "{" until one yields an object. raw_decode stops at
+        # the end of that object, so ```json fences (Gemini sometimes wraps
+        # in ```) and chatter after it - braces included - are ignored
+        start = response.find("{")
+        if start < 0:
+            return self._fallback_response(response)
+        while start >= 0:
+            try:
+                data, _ = _JSON_DECODER.raw_decode(response, start)
+            except ValueError:
+                pass
+            else:
+                if isinstance(data, dict):
+                    return data
+            start = response.find("{", start + 1)
+        logger.warning(f"Failed to parse LLM response: {response[:150]}")
+        return self._fallback_response(response)
+
     def _fallback_response(self, raw_text):
         return {
             "game_phase": "unknown",
@@ -4,14 +4,32 @@ Tries ChromaDB first; falls back to a simple JSON-based store
 if ChromaDB is unavailable (e.g. Python 3.14 compatibility).
 """
 
+import atexit
+import heapq
 import json
 import logging
 import os
+import queue
+import re
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from difflib import SequenceMatcher
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional speedup; difflib scoring is used without it
+    process = None
+
 from config import settings
 from agent.memory.memory_types import MemoryType
 
@@ -21,54 +39,178 @@ logger = logging.getLogger(__name__)
 # import-time crashes on Python 3.14 (pydantic v1 compat issue).
 _HAS_CHROMA = None  # will be set on first init
 
+# Situation-context strings cached per query; cleared whenever memories are written
+CONTEXT_CACHE_SIZE = 256
+
+# JSON to/from bytes for the fallback store's file
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+# Index settings for the per-type Chroma collections (applied when a collection
+# is created). M=16 / construction_ef=100 are Chroma's defaults, not tuning:
+# pinned on purpose so an upgrade can't silently change the graph.
+_HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 100,
+}
+
+# Background writer: memories waiting to be written (add() blocks when full),
+# and how many to take per store write
+WRITE_QUEUE_SIZE = 10000
+WRITE_RETRIES = 3
+
+# Metadata value types stored as-is; anything else is stored as a JSON string
+_PRIM_TYPES = frozenset((str, int, float, bool))
+
+# Words for the JSON store's inverted index
+_TOKEN_RE = re.compile(r"\w+")
+
 
 class _JsonStore:
-    """Simple JSON file-based memory store as a fallback."""
+    """Simple JSON Lines file-based memory store as a fallback.
+
+    Each add appends its memories as lines instead of rewriting the file.
+    """
 
     def __init__(self, path):
         self._path = path
         self._memories = []
+        # Search indexes, kept out of the saved JSON: lower-cased text per
+        # memory, memory positions per metadata "type", and per word
+        self._lower = []
+        self._by_type = {}
+        self._inv = {}
+        self._torn_tail = False  # file doesn't end in a newline (interrupted append)
         self._load()
 
     def _load(self):
         if os.path.exists(self._path):
-            try:
-                with open(self._path, "r", encoding="utf-8") as f:
-                    self._memories = json.load(f)
-            except Exception:
-                self._memories = []
-
-    def _save(self):
+            with open(self._path, "rb") as f:
+                for line in f:
+                    self._torn_tail = not line.endswith(b"\n")
+                    try:
+                        self._memories.append(_loads(line))
+                    except ValueError:
+                        continue  # torn last line from an interrupted append
+        else:
+            # One-time migration from the old whole-file memories.json
+            legacy = os.path.splitext(self._path)[0] + ".json"
+            if os.path.exists(legacy):
+                try:
+                    with open(legacy, "rb") as f:
+                        self._memories = _loads(f.read())
+                except Exception:
+                    self._memories = []
+                if self._memories:
+                    self._append(self._memories)
+        for idx, mem in enumerate(self._memories):
+            self._index(idx, mem)
+
+    def _index(self, idx, mem):
+        lower = mem["text"].lower()
+        self._lower.append(lower)
+        self._by_type.setdefault(mem["metadata"].get("type"), []).append(idx)
+        inv = self._inv
+        for token in set(_TOKEN_RE.findall(lower)):
+            postings = inv.get(token)
+            if postings is None:
+                inv[token] = {idx}
+            else:
+                postings.add(idx)
+
+    def _word_matches(self, query_lower, n_results, where):
+        """Positions of memories containing every word of the query, in order.
+
+        Returns None when there are fewer than n_results of them, so the
+        caller scores the whole store (or type) instead.
+        """
+        tokens = set(_TOKEN_RE.findall(query_lower))
+        if not tokens:
+            return None
+        postings = sorted((self._inv.get(t, ()) for t in tokens), key=len)
+        if len(postings[0]) < n_results:
+            return None
+        hits = set(postings[0]).intersection(*postings[1:])
+        if where:
+            wanted = where.get("type")
+            memories = self._memories
+            hits = [i for i in hits if memories[i]["metadata"].get("type") == wanted]
+        if len(hits) < n_results:
+            return None
+        return sorted(hits)
+
+    def _append(self, mems):
+        """Append memories to the JSON Lines file (one object per line)."""
         os.makedirs(os.path.dirname(self._path), exist_ok=True)
-        with open(self._path, "w", encoding="utf-8") as f:
-            json.dump(self._memories, f, indent=2)
+        lines = b"".join(_dumps(mem) + b"\n" for mem in mems)
+        with open(self._path, "ab") as f:
+            f.write(b"\n" + lines if self._torn_tail else lines)
+        self._torn_tail = False
 
     def add(self, memory_id, text, metadata):
-        self._memories.append({
-            "id": memory_id,
-            "text": text,
-            "metadata": metadata,
-        })
-        self._save()
+        self.add_many([(memory_id, text, metadata)])
+
+    def add_many(self, entries):
+        new = []
+        for memory_id, text, metadata in entries:
+            mem = {
+                "id": memory_id,
+                "text": text,
+                "metadata": metadata,
+            }
+            self._index(len(self._memories), mem)
+            self._memories.append(mem)
+            new.append(mem)
+        self._append(new)
 
     def search(self, query, n_results, where=None):
-        """Simple substring + similarity search."""
+        """Simple substring + similarity search.
+
+        When at least n_results memories contain every word of the query,
+        only those are scored.
+        """
         query_lower = query.lower()
-        scored = []
-        for mem in self._memories:
-            if where:
-                if mem["metadata"].get("type") != where.get("type"):
-                    continue
-            text = mem["text"]
-            # Score by substring match + sequence similarity
-            score = 0.0
-            if query_lower in text.lower():
-                score += 0.5
-            score += SequenceMatcher(None, query_lower, text.lower()).ratio()
-            scored.append((score, mem))
+        idxs = self._word_matches(query_lower, n_results, where)
+        if idxs is None and where:
+            idxs = self._by_type.get(where.get("type"), ())
+        if idxs is not None:
+            mems = [self._memories[i] for i in idxs]
+            texts = [self._lower[i] for i in idxs]
+        else:
+            mems = self._memories
+            texts = self._lower
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        top = scored[:n_results]
+        if process is not None:
+            # WRatio already rewards substring (partial) matches; top-k in C
+            hits = process.extract(query_lower, texts, scorer=fuzz.WRatio, limit=n_results)
+            top = [(score / 100.0, mems[idx]) for _, score, idx in hits]
+        else:
+            # Score by substring match + sequence similarity. As in
+            # difflib.get_close_matches, the cheap ratio upper bounds skip
+            # texts that can no longer make the top k before the full ratio().
+            matcher = SequenceMatcher(None, query_lower)
+            heap = []  # min-heap of (score, position, memory), size <= n_results
+            for pos, (mem, text) in enumerate(zip(mems, texts) if n_results > 0 else ()):
+                matcher.set_seq2(text)
+                bonus = 0.5 if query_lower in text else 0.0
+                if len(heap) == n_results and (
+                    bonus + matcher.real_quick_ratio() <= heap[0][0]
+                    or bonus + matcher.quick_ratio() <= heap[0][0]
+                ):
+                    continue
+                item = (bonus + matcher.ratio(), -pos, mem)
+                if len(heap) < n_results:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+            top = [(score, mem) for score, _, mem in sorted(heap, key=lambda x: x[:2], reverse=True)]
 
         return {
             "documents": [[m["text"] for _, m in top]],
@@ -89,14 +231,112 @@ class _JsonStore:
         return len(self._memories)
 
 
+class _SqliteStore:
+    """SQLite FTS5 memory store: BM25-ranked word search, used as the fallback
+    when the sqlite3 build has FTS5 (otherwise _JsonStore is used).
+
+    Memories from an existing memories.jsonl (or the older memories.json it
+    replaced) are imported on first use.
+    """
+
+    def __init__(self, path, jsonl_path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written by ChromaStore's writer thread, read by the agent thread;
+        # ChromaStore serializes the two with its _store_lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Raises OperationalError ("no such module: fts5") without FTS5
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS memories USING fts5("
+                "text, metadata_json UNINDEXED, id UNINDEXED, type UNINDEXED)"
+            )
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+        if not self.count():
+            # _JsonStore reads memories.jsonl, or migrates memories.json if
+            # only that exists; ChromaStore then seeds its id counter from count()
+            old = _JsonStore(jsonl_path)._memories
+            if old:
+                self.add_many((m["id"], m["text"], m["metadata"]) for m in old)
+                logger.info(f"Imported {len(old)} memories into {path}")
+
+    def add(self, memory_id, text, metadata):
+        self.add_many([(memory_id, text, metadata)])
+
+    def add_many(self, entries):
+        rows = [
+            (text, _dumps(metadata).decode("utf-8"), memory_id, metadata.get("type"))
+            for memory_id, text, metadata in entries
+        ]
+        with self._conn:  # one transaction per batch
+            self._conn.executemany(
+                "INSERT INTO memories (text, metadata_json, id, type) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def search(self, query, n_results, where=None):
+        """BM25 search for memories containing any word of the query."""
+        # Each word quoted, so query text can't be read as FTS5 syntax
+        words = dict.fromkeys(_TOKEN_RE.findall(query.lower()))
+        rows = []
+        if words and n_results > 0:
+            match = " OR ".join(f'"{w}"' for w in words)
+            sql = "SELECT id, text, metadata_json, rank FROM memories WHERE memories MATCH ?"
+            params = [match]
+            if where:
+                sql += " AND type = ?"
+                params.append(where.get("type"))
+            sql += " ORDER BY rank LIMIT ?"
+            params.append(n_results)
+            rows = self._conn.execute(sql, params).fetchall()
+        return {
+            "documents": [[r[1] for r in rows]],
+            "metadatas": [[_loads(r[2]) for r in rows]],
+            # rank is BM25 negated (lower is better); map it onto (0, 1]
+            "distances": [[1.0 / (1.0 - r[3]) for r in rows]],
+            "ids": [[r[0] for r in rows]],
+        }
+
+    def get(self, limit, **kwargs):
+        rows = self._conn.execute(
+            "SELECT id, text, metadata_json FROM memories ORDER BY rowid DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        rows.reverse()
+        return {
+            "ids": [r[0] for r in rows],
+            "documents": [r[1] for r in rows],
+            "metadatas": [_loads(r[2]) for r in rows],
+        }
+
+    def count(self):
+        return self._conn.execute("SELECT count(*) FROM memories").fetchone()[0]
+
+
 class ChromaStore:
-    """Memory store with ChromaDB or JSON fallback."""
+    """Memory store with ChromaDB or a local (SQLite FTS5 / JSON) fallback."""
 
     def __init__(self):
         global _HAS_CHROMA
         self._use_chroma = False
-        self.collection = None
-        self._json_store = None
+        # One Chroma collection per memory type, so a category search walks a
+        # smaller HNSW graph with no metadata filter; memory counts per type
+        self._collections = {}
+        self._type_counts = {}
+        self._local_store = None
+        self._context_cache = OrderedDict()
+        self._context_lock = threading.Lock()
+        self._context_gen = 0  # bumped per write so in-flight searches aren't cached
+        self._counter_lock = threading.Lock()
+        # IDs handed out only ever grow; memories whose write failed are
+        # counted here and subtracted in total_memories
+        self._failed = 0
+        # Held by the writer thread while it writes; the local stores aren't thread-safe
+        self._store_lock = threading.Lock()
+        chroma_dir = os.fspath(settings.CHROMA_DIR)
 
         # Lazy import ChromaDB to avoid import-time pydantic v1 crash on Python 3.14
         if _HAS_CHROMA is None:
@@ -105,64 +345,214 @@ class ChromaStore:
                 _HAS_CHROMA = True
             except Exception:
                 _HAS_CHROMA = False
-                logger.warning("ChromaDB unavailable - using JSON fallback memory store")
+                logger.warning("ChromaDB unavailable - using local fallback memory store")
 
         if _HAS_CHROMA:
             try:
                 import chromadb
                 from chromadb.config import Settings as ChromaSettings
+                from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
                 self.client = chromadb.PersistentClient(
-                    path=str(settings.CHROMA_DIR),
+                    path=chroma_dir,
                     settings=ChromaSettings(anonymized_telemetry=False),
                 )
-                self.collection = self.client.get_or_create_collection(
-                    name=settings.MEMORY_COLLECTION,
-                    metadata={"hnsw:space": "cosine"},
+                # Shared by all collections so a query is embedded only once
+                self._embed = DefaultEmbeddingFunction()
+                for memory_type in MemoryType:
+                    self._collection_for(memory_type.value)
+                # A failed migration keeps Chroma: the old collection is left
+                # in place and retried on the next start
+                try:
+                    self._migrate_single_collection()
+                except Exception as e:
+                    logger.warning(f"Collection migration failed ({e}); retrying next start")
+                self._counter = sum(self._type_counts.values())
+                self._query_pool = ThreadPoolExecutor(
+                    max_workers=len(MemoryType), thread_name_prefix="memory-query",
                 )
-                self._counter = self.collection.count()
                 self._use_chroma = True
                 logger.info(f"ChromaDB initialized with {self._counter} memories")
             except Exception as e:
                 _HAS_CHROMA = False
-                logger.warning(f"ChromaDB init failed ({e}), using JSON fallback")
+                logger.warning(f"ChromaDB init failed ({e}), using local fallback")
 
         if not self._use_chroma:
-            json_path = os.path.join(str(settings.CHROMA_DIR), "memories.json")
-            self._json_store = _JsonStore(json_path)
-            self._counter = self._json_store.count()
-            logger.info(f"JSON memory store initialized with {self._counter} memories")
+            json_path = os.path.join(chroma_dir, "memories.jsonl")
+            try:
+                db_path = os.path.join(chroma_dir, "memories.db")
+                self._local_store = _SqliteStore(db_path, json_path)
+                kind = "SQLite"
+            except sqlite3.Error as e:
+                logger.warning(f"SQLite FTS5 store unavailable ({e}), using JSON file")
+                self._local_store = _JsonStore(json_path)
+                kind = "JSON"
+            self._counter = self._local_store.count()
+            logger.info(f"{kind} memory store initialized with {self._counter} memories")
+
+        # Memories queued by add() and written in batches by _writer_loop
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._writer_loop, name="memory-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _collection_for(self, type_value):
+        """The collection holding memories of one type, created on first use."""
+        collection = self._collections.get(type_value)
+        if collection is None:
+            collection = self.client.get_or_create_collection(
+                name=f"{settings.MEMORY_COLLECTION}_{type_value}",
+                metadata=_HNSW_METADATA,
+                embedding_function=self._embed,
+            )
+            self._collections[type_value] = collection
+            self._type_counts[type_value] = collection.count()
+        return collection
+
+    def _migrate_single_collection(self):
+        """Move memories from the old all-types collection into per-type ones.
+
+        Copied in pages of the client's max batch size. The old collection is
+        only deleted once every page is written; upsert makes a retry after a
+        partial migration overwrite the copies instead of failing on their ids.
+        """
+        try:
+            old = self.client.get_collection(settings.MEMORY_COLLECTION)
+        except Exception:
+            return  # never existed or already migrated
+        batch_size = self.client.get_max_batch_size()
+        moved = 0
+        while True:
+            data = old.get(
+                include=["documents", "metadatas", "embeddings"],
+                limit=batch_size, offset=moved,
+            )
+            if not data["ids"]:
+                break
+            by_type = {}
+            for i, meta in enumerate(data["metadatas"]):
+                type_value = (meta or {}).get("type", MemoryType.GENERAL.value)
+                by_type.setdefault(type_value, []).append(i)
+            # Stored embeddings are reused, so nothing is re-embedded
+            for type_value, idxs in by_type.items():
+                self._collection_for(type_value).upsert(
+                    ids=[data["ids"][i] for i in idxs],
+                    documents=[data["documents"][i] for i in idxs],
+                    metadatas=[data["metadatas"][i] for i in idxs],
+                    embeddings=[data["embeddings"][i] for i in idxs],
+                )
+            moved += len(data["ids"])
+        for type_value, collection in self._collections.items():
+            self._type_counts[type_value] = collection.count()
+        self.client.delete_collection(settings.MEMORY_COLLECTION)
+        logger.info(f"Split {moved} memories into per-type collections")
 
     def add(self, text, category=MemoryType.GENERAL, metadata=None):
-        """Store a new memory. Returns the memory ID."""
+        """Queue a new memory for the background writer. Returns the memory ID.
+
+        The memory becomes searchable once the writer thread has stored it,
+        within about MEMORY_WRITE_LINGER seconds; flush() waits for that.
+        """
         if not text or not text.strip():
             return ""
+        memory_id, meta = self._prepare(category, metadata)
+        self._queue.put((memory_id, text, meta))
+        return memory_id
 
-        self._counter += 1
-        memory_id = f"mem_{self._counter}_{int(time.time())}"
+    def flush(self):
+        """Block until every queued memory has been written."""
+        self._queue.join()
+
+    def _writer_loop(self):
+        """Drain the queue, writing up to MEMORY_WRITE_BATCH memories at a time.
+
+        After the first memory arrives, waits up to MEMORY_WRITE_LINGER seconds
+        for more so bursts of adds share one write.
+        """
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            deadline = time.monotonic() + settings.MEMORY_WRITE_LINGER
+            while len(batch) < settings.MEMORY_WRITE_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"Memory writer error: {e}")
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def _write(self, pending):
+        """Write one batch with a single add per collection (or local store)."""
+        # Groups still to write; a retry skips the ones already written
+        groups = {}
+        if self._use_chroma:
+            for entry in pending:
+                groups.setdefault(entry[2]["type"], []).append(entry)
+        else:
+            groups[None] = pending
+
+        for attempt in range(1, WRITE_RETRIES + 1):
+            try:
+                with self._store_lock:
+                    while groups:
+                        type_value, group = next(iter(groups.items()))
+                        if self._use_chroma:
+                            ids, documents, metadatas = map(list, zip(*group))
+                            self._collection_for(type_value).add(
+                                ids=ids,
+                                documents=documents,
+                                metadatas=metadatas,
+                            )
+                            self._type_counts[type_value] += len(group)
+                        else:
+                            self._local_store.add_many(group)
+                        del groups[type_value]
+                break
+            except Exception as e:
+                if attempt == WRITE_RETRIES:
+                    failed = sum(map(len, groups.values()))
+                    logger.warning(f"Failed to store {failed} memories: {e}")
+                    with self._counter_lock:
+                        self._failed += failed
+                    return
+                time.sleep(0.5 * attempt)
+        with self._context_lock:
+            self._context_cache.clear()
+            self._context_gen += 1
+
+        for _, text, meta in pending:
+            logger.debug(f"Stored memory [{meta['type']}]: {text[:80]}")
+
+    def _prepare(self, category, metadata):
+        """Allocate an ID and build the stored metadata for one memory."""
+        with self._counter_lock:
+            self._counter += 1
+            counter = self._counter
+        now = time.time()
+        unix_time = int(now)
+        memory_id = f"mem_{counter}_{unix_time}"
 
         meta = {
             "type": category.value if isinstance(category, MemoryType) else str(category),
-            "timestamp": datetime.now().isoformat(),
-            "unix_time": int(time.time()),
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+            "unix_time": unix_time,
         }
         if metadata:
             for k, v in metadata.items():
-                if isinstance(v, (str, int, float, bool)):
+                # Exact-type check first; isinstance still admits subclasses
+                # such as str enums
+                if type(v) in _PRIM_TYPES or isinstance(v, (str, int, float, bool)):
                     meta[k] = v
                 else:
-                    meta[k] = json.dumps(v)
-
-        if self._use_chroma:
-            self.collection.add(
-                ids=[memory_id],
-                documents=[text],
-                metadatas=[meta],
-            )
-        else:
-            self._json_store.add(memory_id, text, meta)
-
-        logger.debug(f"Stored memory [{category}]: {text[:80]}")
-        return memory_id
+                    meta[k] = _dumps(v).decode("utf-8")
+        return memory_id, meta
 
     def search(self, query, n_results=None, category=None):
         """Retrieve relevant memories via similarity search."""
@@ -176,78 +566,127 @@ class ChromaStore:
 
         try:
             if self._use_chroma:
-                results = self.collection.query(
-                    query_texts=[query],
-                    n_results=min(n_results, max(self._counter, 1)),
-                    where=where,
-                )
+                results = self._query_collections(query, n_results, where and where["type"])
             else:
-                results = self._json_store.search(query, n_results, where)
+                with self._store_lock:
+                    results = self._local_store.search(query, n_results, where)
         except Exception as e:
             logger.warning(f"Memory search failed: {e}")
             return []
 
-        memories = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
-                memories.append({
-                    "content": doc,
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results["distances"] else 0,
-                    "id": results["ids"][0][i] if results["ids"] else "",
-                })
+        if not (results["documents"] and results["documents"][0]):
+            return []
+        docs = results["documents"][0]
+        n = len(docs)
+        metas = results["metadatas"][0] if results["metadatas"] else [{}] * n
+        dists = results["distances"][0] if results["distances"] else [0] * n
+        ids = results["ids"][0] if results["ids"] else [""] * n
+        return [
+            {"content": doc, "metadata": meta, "distance": dist, "id": mid}
+            for doc, meta, dist, mid in zip(docs, metas, dists, ids)
+        ]
+
+    def _query_collections(self, query, n_results, type_value=None):
+        """Query one type's collection, or all of them in parallel, merging
+        the hits by distance into a single Chroma-style result."""
+        if type_value is None:
+            types = [t for t, count in self._type_counts.items() if count]
+        else:
+            types = [type_value] if self._type_counts.get(type_value) else []
+        if not types or n_results <= 0:
+            return {"documents": [[]], "metadatas": [[]], "distances": [[]], "ids": [[]]}
+        embedding = self._embed([query])
+
+        def query_one(t):
+            return self._collections[t].query(
+                query_embeddings=embedding,
+                n_results=min(n_results, self._type_counts[t]),
+            )
 
-        return memories
+        if len(types) == 1:
+            parts = [query_one(types[0])]
+        else:
+            parts = list(self._query_pool.map(query_one, types))
+        hits = heapq.nsmallest(
+            n_results,
+            (
+                hit
+                for r in parts
+                for hit in zip(r["distances"][0], r["ids"][0], r["documents"][0], r["metadatas"][0])
+            ),
+            key=lambda hit: hit[0],
+        )
+        return {
+            "documents": [[h[2] for h in hits]],
+            "metadatas": [[h[3] for h in hits]],
+            "distances": [[h[0] for h in hits]],
+            "ids": [[h[1] for h in hits]],
+        }
 
     def get_recent(self, n=5):
         """Get the N most recent memories."""
         try:
             if self._use_chroma:
-                results = self.collection.get(
-                    limit=n,
-                    include=["documents", "metadatas"],
-                )
+                results = {"ids": [], "documents": [], "metadatas": []}
+                for t, count in self._type_counts.items():
+                    if not count:
+                        continue
+                    part = self._collections[t].get(
+                        limit=n,
+                        include=["documents", "metadatas"],
+                    )
+                    for key in results:
+                        results[key].extend(part[key])
             else:
-                results = self._json_store.get(limit=n)
+                with self._store_lock:
+                    results = self._local_store.get(limit=n)
         except Exception:
             return []
 
-        memories = []
-        if results["documents"]:
-            items = list(zip(
-                results["ids"],
-                results["documents"],
-                results["metadatas"] or [{}] * len(results["documents"]),
-            ))
-            items.sort(
-                key=lambda x: x[2].get("unix_time", 0) if x[2] else 0,
-                reverse=True,
-            )
-            for mid, doc, meta in items[:n]:
-                memories.append({
-                    "content": doc,
-                    "metadata": meta,
-                    "id": mid,
-                })
-
-        return memories
+        if not results["documents"]:
+            return []
+        items = zip(
+            results["ids"],
+            results["documents"],
+            results["metadatas"] or [{}] * len(results["documents"]),
+        )
+        # nlargest is stable like sort(reverse=True): ties keep store order
+        newest = heapq.nlargest(
+            n, items, key=lambda x: x[2].get("unix_time", 0) if x[2] else 0,
+        )
+        return [{"content": doc, "metadata": meta, "id": mid} for mid, doc, meta in newest]
 
     def get_context_for_situation(self, situation):
-        """Build a context string from relevant memories for the current situation."""
-        memories = self.search(situation, n_results=7)
-        if not memories:
-            return ""
+        """Build a context string from relevant memories for the current situation.
 
-        lines = ["Relevant memories from past experience:"]
-        for mem in memories:
-            mem_type = mem["metadata"].get("type", "unknown")
-            content = mem["content"]
-            lines.append(f"  [{mem_type}] {content}")
+        Results are cached per situation string until the next write.
+        """
+        with self._context_lock:
+            context = self._context_cache.get(situation)
+            if context is not None:
+                self._context_cache.move_to_end(situation)
+                return context
+            gen = self._context_gen
 
-        return "\n".join(lines)
+        memories = self.search(situation, n_results=7)
+        if not memories:
+            context = ""
+        else:
+            lines = ["Relevant memories from past experience:"]
+            for mem in memories:
+                mem_type = mem["metadata"].get("type", "unknown")
+                content = mem["content"]
+                lines.append(f"  [{mem_type}] {content}")
+            context = "\n".join(lines)
+
+        with self._context_lock:
+            if gen == self._context_gen:
+                self._context_cache[situation] = context
+                if len(self._context_cache) > CONTEXT_CACHE_SIZE:
+                    self._context_cache.popitem(last=False)
+        return context
 
     @property
     def total_memories(self):
-        if self._use_chroma:
-            return self.collection.count()
-        return self._json_store.count()
+        # Kept by _prepare()/_write(); no count() round-trip to the store
+        return self._counter - self._failed
@@ -4,18 +4,45 @@ Pre-populated with the full game from Pallet Town to Elite Four.
 Same architecture as ClaudeScape's goal_planner.py.
 """
 
+import atexit
 import json
 import logging
+import os
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 PLANS_FILE = settings.PROJECT_ROOT / "agent" / "planning" / "active_plans.json"
+# Goal changes since the last full snapshot, one JSON record per line
+PLANS_LOG_FILE = PLANS_FILE.with_name("active_plans.log.jsonl")
+# Records appended before the log is folded back into PLANS_FILE
+PLANS_COMPACT_EVERY = 1000
+
+# JSON to/from bytes; the plan snapshot is pretty-printed, log records are not
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+    def _dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    def _dumps_pretty(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
 
 
 class GoalStatus(str, Enum):
@@ -27,7 +54,18 @@ class GoalStatus(str, Enum):
     BLOCKED = "blocked"
 
 
-@dataclass
+# Tree-view marker and label for each status
+_STATUS_TAGS = {
+    GoalStatus.PENDING: ("[ ]", "(pending)"),
+    GoalStatus.ACTIVE: ("[>]", "(active)"),
+    GoalStatus.IN_PROGRESS: ("[~]", "(in_progress)"),
+    GoalStatus.COMPLETED: ("[x]", "(completed)"),
+    GoalStatus.FAILED: ("[!]", "(failed)"),
+    GoalStatus.BLOCKED: ("[-]", "(blocked)"),
+}
+
+
+@dataclass(slots=True)
 class Goal:
     """A single goal or sub-goal in the planning tree."""
     id: str
@@ -45,21 +83,9 @@ class Goal:
     completed_at: float | None = None
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "status": self.status.value,
-            "priority": self.priority,
-            "parent_id": self.parent_id,
-            "children_ids": self.children_ids,
-            "prerequisites": self.prerequisites,
-            "notes": self.notes,
-            "attempts": self.attempts,
-            "max_attempts": self.max_attempts,
-            "created_at": self.created_at,
-            "completed_at": self.completed_at,
-        }
+        data = {name: getattr(self, name) for name in _GOAL_FIELDS}
+        data["status"] = self.status.value
+        return data
 
     @classmethod
     def from_dict(cls, data):
@@ -67,13 +93,30 @@ class Goal:
         return cls(**data)
 
 
+# Goal field names in declaration order (the to_dict keys)
+_GOAL_FIELDS = tuple(f.name for f in fields(Goal))
+
+
 class GoalPlanner:
     """Manages the hierarchical goal tree for Pokemon FireRed progression."""
 
     def __init__(self):
         self.goals: dict[str, Goal] = {}
         self._id_counter = 0
+        self._version = 0  # bumped on every mutation (see _save)
+        self._snapshot = None
+        self._snapshot_version = -1
+        self._current_id = None  # get_current_goal() result as of _current_version
+        self._current_version = -1
+        self._chains: dict[str, str] = {}  # goal id -> "A > B" ancestor names
+        # Indexes kept in step with self.goals by _index/_set_status
+        self._by_status: dict[GoalStatus, set[str]] = {s: set() for s in GoalStatus}
+        self._roots: list[str] = []  # top-level goal ids in insertion order
+        self._dependents: dict[str, list[str]] = {}  # goal id -> ids listing it as prerequisite
+        self._unmet: dict[str, int] = {}  # goal id -> prerequisites not yet completed
+        self._log_len = 0  # records in PLANS_LOG_FILE
         self._load()
+        atexit.register(self.compact)
 
     def _next_id(self):
         self._id_counter += 1
@@ -93,11 +136,13 @@ class GoalPlanner:
             prerequisites=prerequisites or [],
         )
         self.goals[goal_id] = goal
+        self._index(goal)
 
         if parent_id and parent_id in self.goals:
             self.goals[parent_id].children_ids.append(goal_id)
-
-        self._save()
+            self._save(goal, self.goals[parent_id])
+        else:
+            self._save(goal)
         return goal_id
 
     def add_subgoals(self, parent_id, subgoals):
@@ -124,7 +169,7 @@ class GoalPlanner:
         if goal_id not in self.goals:
             return
         goal = self.goals[goal_id]
-        goal.status = GoalStatus.COMPLETED
+        self._set_status(goal, GoalStatus.COMPLETED)
         goal.completed_at = time.time()
         if notes:
             goal.notes.append(f"Completed: {notes}")
@@ -139,7 +184,7 @@ class GoalPlanner:
             ):
                 self.complete_goal(parent.id, "All sub-goals completed")
 
-        self._save()
+        self._save(goal)
         logger.info(f"Completed goal: {goal.name}")
 
     def fail_goal(self, goal_id, reason=""):
@@ -149,26 +194,40 @@ class GoalPlanner:
         goal = self.goals[goal_id]
         goal.attempts += 1
         if goal.attempts >= goal.max_attempts:
-            goal.status = GoalStatus.FAILED
+            self._set_status(goal, GoalStatus.FAILED)
             goal.notes.append(f"Failed permanently: {reason}")
             logger.warning(f"Goal permanently failed: {goal.name}")
         else:
-            goal.status = GoalStatus.PENDING
+            self._set_status(goal, GoalStatus.PENDING)
             goal.notes.append(f"Attempt {goal.attempts} failed: {reason}")
             logger.info(f"Goal attempt failed, will retry: {goal.name}")
-        self._save()
+        self._save(goal)
 
     def block_goal(self, goal_id, reason):
         """Mark a goal as blocked."""
         if goal_id in self.goals:
-            self.goals[goal_id].status = GoalStatus.BLOCKED
+            self._set_status(self.goals[goal_id], GoalStatus.BLOCKED)
             self.goals[goal_id].notes.append(f"Blocked: {reason}")
-            self._save()
+            self._save(self.goals[goal_id])
 
     # --- Goal Selection ---
 
     def get_current_goal(self):
         """Get the currently active/in-progress leaf goal."""
+        if self._current_version == self._version:
+            return self.goals.get(self._current_id)
+        version = self._version
+        goal = self._find_current_goal()
+        # Resolving may activate a goal, which can change the next answer; only
+        # cache a lookup that left the tree untouched
+        if self._version == version:
+            self._current_id = goal.id if goal else None
+            self._current_version = version
+        return goal
+
+    def _find_current_goal(self):
+        if not (self._by_status[GoalStatus.ACTIVE] or self._by_status[GoalStatus.IN_PROGRESS]):
+            return self._select_next_goal()
         for goal in self.goals.values():
             if goal.status in (GoalStatus.ACTIVE, GoalStatus.IN_PROGRESS):
                 if goal.children_ids:
@@ -191,35 +250,30 @@ class GoalPlanner:
                         return deeper
                 return child
             if child.status == GoalStatus.PENDING and self._prerequisites_met(child):
-                child.status = GoalStatus.ACTIVE
-                self._save()
+                self._set_status(child, GoalStatus.ACTIVE)
+                self._save(child)
                 return child
         return None
 
     def _select_next_goal(self):
         """Select the highest-priority pending goal whose prerequisites are met."""
+        pending = self._by_status[GoalStatus.PENDING]
         candidates = [
-            g for g in self.goals.values()
-            if g.status == GoalStatus.PENDING
-            and not g.parent_id
-            and self._prerequisites_met(g)
+            g for g in map(self.goals.__getitem__, self._roots)
+            if g.id in pending and self._prerequisites_met(g)
         ]
         if not candidates:
             return None
 
         candidates.sort(key=lambda g: g.priority)
         best = candidates[0]
-        best.status = GoalStatus.ACTIVE
-        self._save()
+        self._set_status(best, GoalStatus.ACTIVE)
+        self._save(best)
         return best
 
     def _prerequisites_met(self, goal):
         """Check if all prerequisites are completed."""
-        for prereq_id in goal.prerequisites:
-            prereq = self.goals.get(prereq_id)
-            if not prereq or prereq.status != GoalStatus.COMPLETED:
-                return False
-        return True
+        return not self._unmet[goal.id]
 
     # --- Context for LLM ---
 
@@ -237,45 +291,42 @@ class GoalPlanner:
         if current.notes:
             parts.append(f"Notes: {'; '.join(current.notes[-3:])}")
 
-        # Show parent chain for context
-        parent_chain = []
-        pid = current.parent_id
-        while pid and pid in self.goals:
-            parent_chain.append(self.goals[pid].name)
-            pid = self.goals[pid].parent_id
-        if parent_chain:
-            parts.append(f"Part of: {' > '.join(reversed(parent_chain))}")
+        # Show parent chain for context (parents and names never change)
+        chain = self._chains.get(current.id)
+        if chain is None:
+            parent_chain = []
+            pid = current.parent_id
+            while pid and pid in self.goals:
+                parent_chain.append(self.goals[pid].name)
+                pid = self.goals[pid].parent_id
+            chain = self._chains[current.id] = " > ".join(reversed(parent_chain))
+        if chain:
+            parts.append(f"Part of: {chain}")
 
         return "\n".join(parts)
 
     def get_goal_tree_text(self):
         """Get a human-readable text representation of the goal tree."""
-        lines = []
-        top_level = [g for g in self.goals.values() if not g.parent_id]
+        goals = self.goals
+        top_level = [goals[gid] for gid in self._roots]
         top_level.sort(key=lambda g: g.priority)
-        for goal in top_level:
-            self._render_goal(goal, lines, indent=0)
+        # Depth-first, children pushed in reverse so they pop in order
+        stack = [(g, "") for g in reversed(top_level)]
+        lines = []
+        while stack:
+            goal, prefix = stack.pop()
+            icon, label = _STATUS_TAGS[goal.status]
+            lines.append(f"{prefix}{icon} {goal.name} {label}")
+            prefix += "  "
+            stack.extend(
+                (goals[cid], prefix) for cid in reversed(goal.children_ids) if cid in goals
+            )
         return "\n".join(lines) if lines else "No goals set."
 
-    def _render_goal(self, goal, lines, indent):
-        status_icons = {
-            GoalStatus.PENDING: "[ ]",
-            GoalStatus.ACTIVE: "[>]",
-            GoalStatus.IN_PROGRESS: "[~]",
-            GoalStatus.COMPLETED: "[x]",
-            GoalStatus.FAILED: "[!]",
-            GoalStatus.BLOCKED: "[-]",
-        }
-        icon = status_icons.get(goal.status, "[?]")
-        prefix = "  " * indent
-        lines.append(f"{prefix}{icon} {goal.name} ({goal.status.value})")
-        for cid in goal.children_ids:
-            child = self.goals.get(cid)
-            if child:
-                self._render_goal(child, lines, indent + 1)
-
     def get_goals_snapshot(self):
         """Get simplified goal list for the dashboard."""
+        if self._snapshot_version == self._version:
+            return self._snapshot
         snapshot = []
         for goal in self.goals.values():
             snapshot.append({
@@ -284,30 +335,91 @@ class GoalPlanner:
                 "parent_id": goal.parent_id,
                 "id": goal.id,
             })
+        self._snapshot = snapshot
+        self._snapshot_version = self._version
         return snapshot
 
+    # --- Indexes ---
+
+    def _index(self, goal):
+        """Add a goal that was just put into self.goals to the indexes."""
+        self._by_status[goal.status].add(goal.id)
+        if not goal.parent_id:
+            self._roots.append(goal.id)
+        unmet = 0
+        for prereq_id in goal.prerequisites:
+            self._dependents.setdefault(prereq_id, []).append(goal.id)
+            prereq = self.goals.get(prereq_id)
+            if not prereq or prereq.status != GoalStatus.COMPLETED:
+                unmet += 1
+        self._unmet[goal.id] = unmet
+
+    def _set_status(self, goal, status):
+        """Change a goal's status, keeping _by_status and _unmet in step."""
+        old = goal.status
+        self._by_status[old].discard(goal.id)
+        self._by_status[status].add(goal.id)
+        goal.status = status
+        if (old == GoalStatus.COMPLETED) != (status == GoalStatus.COMPLETED):
+            step = -1 if status == GoalStatus.COMPLETED else 1
+            for dep_id in self._dependents.get(goal.id, ()):
+                self._unmet[dep_id] += step
+
     # --- Persistence ---
 
-    def _save(self):
-        """Save goals to disk."""
+    def _save(self, *changed):
+        """Persist the *changed* goals by appending them to the change log."""
+        self._version += 1
+        PLANS_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PLANS_LOG_FILE, "ab") as f:
+            f.write(b"".join(
+                _dumps({"counter": self._id_counter, "goal": g.to_dict()}) + b"\n"
+                for g in changed
+            ))
+        self._log_len += len(changed)
+        if self._log_len >= PLANS_COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Write the full goal tree to PLANS_FILE and empty the change log."""
+        if not self._log_len:
+            return
         PLANS_FILE.parent.mkdir(parents=True, exist_ok=True)
         data = {
             "counter": self._id_counter,
             "goals": {gid: g.to_dict() for gid, g in self.goals.items()},
         }
-        PLANS_FILE.write_text(json.dumps(data, indent=2))
+        tmp = PLANS_FILE.with_suffix(".tmp")
+        tmp.write_bytes(_dumps_pretty(data))
+        os.replace(tmp, PLANS_FILE)
+        PLANS_LOG_FILE.unlink(missing_ok=True)
+        self._log_len = 0
 
     def _load(self):
-        """Load goals from disk."""
+        """Load goals from disk: the last snapshot, then the change log on top."""
         if PLANS_FILE.exists():
             try:
-                data = json.loads(PLANS_FILE.read_text())
+                data = _loads(PLANS_FILE.read_bytes())
                 self._id_counter = data.get("counter", 0)
                 for gid, gdata in data.get("goals", {}).items():
                     self.goals[gid] = Goal.from_dict(gdata)
-                logger.info(f"Loaded {len(self.goals)} goals from disk")
             except Exception as e:
                 logger.warning(f"Failed to load plans: {e}")
+        if PLANS_LOG_FILE.exists():
+            with open(PLANS_LOG_FILE, "rb") as f:
+                for line in f:
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted append
+                    goal = Goal.from_dict(record["goal"])
+                    self.goals[goal.id] = goal
+                    self._id_counter = max(self._id_counter, record["counter"])
+                    self._log_len += 1
+        for goal in self.goals.values():
+            self._index(goal)
+        if self.goals:
+            logger.info(f"Loaded {len(self.goals)} goals from disk")
 
     # --- Pre-populated FireRed Progression ---
 
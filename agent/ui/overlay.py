@@ -5,11 +5,12 @@ Clean, professional HUD showing bot thoughts in real-time.
 
 import ctypes
 import ctypes.wintypes
+import functools
 import logging
-import queue
 import threading
 import tkinter as tk
 import time
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,12 @@ BLUE = "#448aff"
 PURPLE = "#bb86fc"
 CYAN = "#00d4ff"
 
+# The first update() schedules a render this many ms later; updates arriving
+# in the meantime only replace the data, so redraws are capped at 20 Hz
+RENDER_COALESCE_MS = 50
+# Slow poll for updates whose render couldn't be scheduled (before mainloop)
+FALLBACK_POLL_MS = 1000
+
 PHASE_COLORS = {
     "overworld": GREEN, "battle": RED, "dialogue": YELLOW,
     "menu": BLUE, "transition": TEXT_DIM, "title": PURPLE,
@@ -46,15 +53,35 @@ PHASE_LABELS = {
 }
 
 
+# (label, color) per phase, so _render needs a single lookup
+PHASE_INFO = {k: (PHASE_LABELS[k], PHASE_COLORS[k]) for k in PHASE_LABELS}
+
+
+@functools.lru_cache(maxsize=64)
+def _phase_info(phase):
+    """(label, color) for a game phase; unknown phases are shown upper-cased."""
+    return PHASE_INFO.get(phase) or (phase.upper(), TEXT_DIM)
+
+
 class Overlay:
     def __init__(self, hwnd=None, width=340):
         self._hwnd_mgba = hwnd
         self._width = width
         self._height = 400
-        self._queue = queue.Queue()
+        # Newest update not yet rendered. Single producer (game loop) / single
+        # consumer (Tk thread); deque append/popleft are atomic and maxlen=1
+        # keeps only the latest
+        self._latest = deque(maxlen=1)
+        self._flush_scheduled = False  # a _flush is waiting on an after()
         self._root = None
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self._pulse_on = True
+        # Last options passed to each widget by _set, and the (current, max)
+        # HP the bar shows; unchanged values skip the Tk round-trip
+        self._last = {}
+        self._hp_drawn = None
+        self._last_el = -1  # uptime second shown by the uptime label
+        self._last_rect = ()  # mGBA window rect the overlay was last placed for
 
         self._thread = threading.Thread(
             target=self._run_tk, daemon=True, name="OverlayThread",
@@ -75,23 +102,37 @@ class Overlay:
             self._position_window()
             self._build_ui()
             self._root.after(200, self._apply_win32_flags)
-            self._root.after(150, self._poll_queue)
+            self._root.after(FALLBACK_POLL_MS, self._fallback_poll)
             self._root.after(700, self._pulse)
+            self._root.after(1000, self._reposition_tick)
             self._root.mainloop()
         except Exception as e:
             logger.error(f"Overlay thread error: {e}")
 
     def _position_window(self):
+        """Dock to the mGBA window's top-right; no-op if it hasn't moved."""
         x, y = 100, 100
+        rect = None
         if self._hwnd_mgba:
             r = ctypes.wintypes.RECT()
             user32.GetWindowRect(self._hwnd_mgba, ctypes.byref(r))
+            rect = (r.left, r.top, r.right, r.bottom)
             x = r.right - self._width - 10
             y = r.top + 40
-        if self._root:
+        if self._root and rect != self._last_rect:
             x = max(0, min(x, self._root.winfo_screenwidth() - self._width - 10))
             y = max(0, min(y, self._root.winfo_screenheight() - self._height - 10))
             self._root.geometry(f"{self._width}x{self._height}+{x}+{y}")
+            self._last_rect = rect
+
+    def _reposition_tick(self):
+        """Follow the mGBA window once a second, independent of renders."""
+        try:
+            self._position_window()
+        except Exception as e:
+            logger.debug(f"Reposition error: {e}")
+        if self._root:
+            self._root.after(1000, self._reposition_tick)
 
     # ── Build UI ─────────────────────────────────────────────
 
@@ -255,23 +296,29 @@ class Overlay:
         )
         self._hp_canvas.pack(fill="x", pady=4)
         self._hp_bar_w = w - 28
+        # Bar items are created once; _draw_hp_bar only moves/recolors them
+        c = self._hp_canvas
+        c.create_rectangle(0, 0, self._hp_bar_w, 8, fill=BG_CARD, outline=BG_SURFACE, width=1)
+        self._hp_fill_id = c.create_rectangle(0, 0, 0, 0, outline="", state="hidden")
+        self._hp_shine_id = c.create_rectangle(0, 0, 0, 0, outline="", state="hidden")
+        self._hp_line_id = c.create_line(0, 0, 0, 0, fill="#ffffff", width=1, state="hidden")
         self._draw_hp_bar(0, 1)
 
     # ── HP bar drawing ───────────────────────────────────────
 
     def _draw_hp_bar(self, current, maximum):
+        if (current, maximum) == self._hp_drawn:
+            return
+        self._hp_drawn = (current, maximum)
         c = self._hp_canvas
-        c.delete("all")
         bw = self._hp_bar_w
         bh = 8
 
-        c.create_rectangle(0, 0, bw, bh, fill=BG_CARD, outline=BG_SURFACE, width=1)
-
-        if maximum <= 0:
-            return
-        ratio = max(0, min(current / maximum, 1.0))
+        ratio = max(0, min(current / maximum, 1.0)) if maximum > 0 else 0
         fw = int(bw * ratio)
         if fw <= 0:
+            for item in (self._hp_fill_id, self._hp_shine_id, self._hp_line_id):
+                c.itemconfigure(item, state="hidden")
             return
 
         if ratio > 0.5:
@@ -281,10 +328,15 @@ class Overlay:
         else:
             color, shine = RED, "#ff8a80"
 
-        c.create_rectangle(1, 1, fw, bh - 1, fill=color, outline="")
-        c.create_rectangle(2, 2, fw - 1, bh // 2, fill=shine, outline="")
+        c.coords(self._hp_fill_id, 1, 1, fw, bh - 1)
+        c.itemconfigure(self._hp_fill_id, fill=color, state="normal")
+        c.coords(self._hp_shine_id, 2, 2, fw - 1, bh // 2)
+        c.itemconfigure(self._hp_shine_id, fill=shine, state="normal")
         if fw > 4:
-            c.create_line(2, 1, fw - 1, 1, fill="#ffffff", width=1)
+            c.coords(self._hp_line_id, 2, 1, fw - 1, 1)
+            c.itemconfigure(self._hp_line_id, state="normal")
+        else:
+            c.itemconfigure(self._hp_line_id, state="hidden")
 
     # ── Animations ───────────────────────────────────────────
 
@@ -314,80 +366,82 @@ class Overlay:
         except Exception as e:
             logger.warning(f"Win32 flags failed: {e}")
 
-    # ── Queue polling ────────────────────────────────────────
+    # ── Update flushing ──────────────────────────────────────
 
-    def _poll_queue(self):
-        try:
-            while not self._queue.empty():
-                self._render(self._queue.get_nowait())
-        except queue.Empty:
-            pass
-        except Exception as e:
-            logger.debug(f"Poll error: {e}")
+    def _fallback_poll(self):
+        self._flush()
         if self._root:
-            self._root.after(150, self._poll_queue)
+            self._root.after(FALLBACK_POLL_MS, self._fallback_poll)
+
+    def _flush(self):
+        """Render the newest update, if any (Tk thread)."""
+        # Cleared before taking the data, so an update arriving from here on
+        # schedules another flush
+        self._flush_scheduled = False
+        try:
+            data = self._latest.popleft()
+        except IndexError:
+            return
+        self._render(data)
 
     # ── Render data ──────────────────────────────────────────
 
+    def _set(self, widget, **options):
+        """widget.config(**options), skipped if identical to the last call."""
+        if self._last.get(widget) != options:
+            widget.config(**options)
+            self._last[widget] = options
+
     def _render(self, data):
         try:
             tick = data.get("tick", 0)
 
             # Uptime
-            el = int(time.time() - self._start_time)
-            self._lbl_tick.config(text=f"#{tick}")
-            self._lbl_uptime.config(text=f"{el//3600:02d}:{(el%3600)//60:02d}:{el%60:02d}")
+            el = int(time.monotonic() - self._start_time)
+            self._set(self._lbl_tick, text=f"#{tick}")
+            if el != self._last_el:
+                self._last_el = el
+                self._set(self._lbl_uptime, text=f"{el//3600:02d}:{(el%3600)//60:02d}:{el%60:02d}")
 
             # Phase
             phase = data.get("game_phase", "unknown")
-            color = PHASE_COLORS.get(phase, TEXT_DIM)
-            label = PHASE_LABELS.get(phase, phase.upper())
-            self._lbl_phase.config(text=label, fg=color)
-            self._lbl_phase_dot.config(fg=color)
+            label, color = _phase_info(phase)
+            self._set(self._lbl_phase, text=label, fg=color)
+            self._set(self._lbl_phase_dot, fg=color)
 
             # Observation (full text, no truncation - label wraps)
-            self._lbl_obs.config(text=data.get("observation", "--"))
+            self._set(self._lbl_obs, text=data.get("observation", "--"))
 
             # Reasoning
-            self._lbl_reasoning.config(text=data.get("reasoning", "--"))
+            self._set(self._lbl_reasoning, text=data.get("reasoning", "--"))
 
             # Action
-            self._lbl_action_key.config(text=data.get("action", "--"))
+            self._set(self._lbl_action_key, text=data.get("action", "--"))
             detail = data.get("action_detail", "")
-            self._lbl_action_detail.config(text=detail if detail else "")
+            self._set(self._lbl_action_detail, text=detail if detail else "")
 
             # Plan
             plan = data.get("next_plan", "--")
             if len(plan) > 60:
                 plan = plan[:57] + "..."
-            self._lbl_plan.config(text=plan)
+            self._set(self._lbl_plan, text=plan)
 
             # HP
-            hp_str = data.get("hp_status", "--")
-            hp_c, hp_m = 0, 1
-            name = "--"
-            if ":" in hp_str and "/" in hp_str:
-                try:
-                    name = hp_str.split(":")[0].strip()
-                    nums = hp_str.split(":")[1].strip()
-                    parts = nums.split("/")
-                    hp_c = int(parts[0].strip())
-                    hp_m = int(parts[1].strip())
-                except (ValueError, IndexError):
-                    pass
-
-            self._lbl_hp_name.config(text=name)
-            self._lbl_hp_nums.config(text=f"{hp_c}/{hp_m}" if hp_m > 0 else "--")
-
-            self._draw_hp_bar(hp_c, hp_m)
+            name = data.get("hp_name", "--")
+            hp_c = data.get("hp_cur", 0)
+            hp_m = data.get("hp_max", 1)
 
+            self._set(self._lbl_hp_name, text=name)
             if hp_m > 0:
                 r = hp_c / hp_m
-                self._lbl_hp_nums.config(
-                    fg=GREEN if r > 0.5 else YELLOW if r > 0.2 else RED
+                self._set(
+                    self._lbl_hp_nums, text=f"{hp_c}/{hp_m}",
+                    fg=GREEN if r > 0.5 else YELLOW if r > 0.2 else RED,
                 )
+            else:
+                self._set(self._lbl_hp_nums, text="--")
 
-            self._position_window()
+            self._draw_hp_bar(hp_c, hp_m)
 
         except Exception as e:
             logger.debug(f"Render error: {e}")
@@ -395,15 +449,15 @@ class Overlay:
     # ── Public API ───────────────────────────────────────────
 
     def update(self, data):
-        try:
-            while self._queue.qsize() > 2:
-                try:
-                    self._queue.get_nowait()
-                except queue.Empty:
-                    break
-            self._queue.put_nowait(data)
-        except Exception:
-            pass
+        self._latest.append(data)
+        root = self._root
+        if root is not None and not self._flush_scheduled:
+            self._flush_scheduled = True
+            try:
+                # Tk marshals this to its own thread
+                root.after(RENDER_COALESCE_MS, self._flush)
+            except Exception:
+                self._flush_scheduled = False  # picked up by the fallback poll
 
     def shutdown(self):
         if self._root:
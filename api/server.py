@@ -3,14 +3,93 @@ Lightweight API server for Railway.
 Reads live feed data from PostgreSQL and serves it to the Vercel frontend.
 """
 
+import base64
+import gzip
 import json
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 import psycopg2
+import psycopg2.pool
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 
+# JSON to bytes; session timestamps are naive datetimes, written in ISO format
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+    def _dumps(obj):
+        return json.dumps(obj, default=lambda o: o.isoformat()).encode()
+
+# Constant response bodies, encoded once
+HEALTH_BODY = _dumps({"status": "ok"})
+NOT_FOUND_BODY = _dumps({"error": "not found"})
+
+# Response bodies at least this long are gzipped for clients that accept it
+GZIP_MIN_BYTES = 512
+
+# /feed body (and its gzip form) is reused for this long, so a burst of polls
+# from many viewers costs one query; the agent pushes far less often than this
+FEED_CACHE_TTL = 0.25
+_feed_cache = {"ts": float("-inf"), "body": b"", "gzip": None}
+_feed_lock = threading.Lock()
+
+# Read connections are pooled (created on first request) instead of opened per
+# request; each runs _PREPARE_SQL once so the two reads skip re-planning.
+# psycopg2 closes a returned connection once POOL_MIN_CONN sit idle, so the
+# minimum is sized for the usual number of concurrent requests.
+POOL_MIN_CONN = 4
+POOL_MAX_CONN = 10
+_pool = None
+_pool_lock = threading.Lock()
+_prepared = weakref.WeakSet()  # connections that have run _PREPARE_SQL
+_PREPARE_SQL = """
+    PREPARE live_feed_sel AS
+        SELECT data, updated_at, screenshot FROM live_feed WHERE id = 1;
+    PREPARE sessions_sel(int) AS
+        SELECT id, started_at, ended_at, ticks, badges,
+               pokemon_caught, whiteouts, duration_secs
+        FROM sessions ORDER BY id DESC LIMIT $1;
+"""
+
+
+@contextmanager
+def _connection():
+    """Borrow a pooled connection; one that failed at the socket level is
+    closed rather than returned to the pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    POOL_MIN_CONN, POOL_MAX_CONN, DATABASE_URL,
+                )
+    conn = _pool.getconn()
+    broken = False
+    try:
+        if conn not in _prepared:
+            conn.autocommit = True  # plain reads; don't hold a transaction open
+            with conn.cursor() as cur:
+                cur.execute(_PREPARE_SQL)
+            _prepared.add(conn)
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        if broken:
+            _prepared.discard(conn)
+        _pool.putconn(conn, close=broken)
+
 
 def init_db():
     """Create tables if they don't exist."""
@@ -21,18 +100,16 @@ def init_db():
     try:
         conn.autocommit = True
         with conn.cursor() as cur:
+            # One multi-statement execute: a single round-trip to Postgres
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS live_feed (
                     id INTEGER PRIMARY KEY DEFAULT 1,
                     data JSONB NOT NULL,
                     updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
-            cur.execute(
-                "INSERT INTO live_feed (id, data) VALUES (1, '{}') "
-                "ON CONFLICT (id) DO NOTHING"
-            )
-            cur.execute("""
+                );
+                INSERT INTO live_feed (id, data) VALUES (1, '{}')
+                    ON CONFLICT (id) DO NOTHING;
+                ALTER TABLE live_feed ADD COLUMN IF NOT EXISTS screenshot BYTEA;
                 CREATE TABLE IF NOT EXISTS sessions (
                     id SERIAL PRIMARY KEY,
                     started_at TIMESTAMP DEFAULT NOW(),
@@ -42,89 +119,106 @@ def init_db():
                     pokemon_caught INTEGER DEFAULT 0,
                     whiteouts INTEGER DEFAULT 0,
                     duration_secs INTEGER DEFAULT 0
-                )
+                );
             """)
     finally:
         conn.close()
 
 
 def get_live_feed():
-    """Read the latest live feed row."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT data, updated_at FROM live_feed WHERE id = 1")
-            row = cur.fetchone()
-            if row:
-                return row[0], row[1]
-            return None, None
-    finally:
-        conn.close()
+    """Read the latest live feed row.
+
+    The agent stores the screenshot as raw JPEG in its own column; it is
+    re-attached as base64 under "screenshot" for the frontend.
+    """
+    with _connection() as conn, conn.cursor() as cur:
+        cur.execute("EXECUTE live_feed_sel")
+        row = cur.fetchone()
+        if row:
+            data, updated_at, screenshot = row
+            if screenshot is not None and data is not None:
+                data["screenshot"] = base64.b64encode(bytes(screenshot)).decode("ascii")
+            return data, updated_at
+        return None, None
 
 
 def get_sessions(limit=10):
     """Get recent sessions."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """SELECT id, started_at, ended_at, ticks, badges,
-                          pokemon_caught, whiteouts, duration_secs
-                   FROM sessions ORDER BY id DESC LIMIT %s""",
-                (limit,),
+    with _connection() as conn, conn.cursor() as cur:
+        # LIMIT keeps the page server-side; rows are consumed as they are read
+        cur.execute("EXECUTE sessions_sel(%s)", (limit,))
+        return [
+            {
+                "id": sid,
+                "started_at": started_at,
+                "ended_at": ended_at,
+                "ticks": ticks or 0,
+                "badges": badges or 0,
+                "pokemon_caught": caught or 0,
+                "whiteouts": whiteouts or 0,
+                "duration": _format_duration(dur) if (dur or 0) > 0 else "running...",
+            }
+            for sid, started_at, ended_at, ticks, badges, caught, whiteouts, dur in cur
+        ]
+
+
+def _format_duration(secs):
+    """Seconds as "Hh Mm Ss"."""
+    mins, secs = divmod(secs, 60)
+    return "%dh %dm %ds" % (*divmod(mins, 60), secs)
+
+
+def get_feed_body():
+    """Encoded /feed JSON and its gzip form (None if too small to compress),
+    served from _feed_cache while it is fresh."""
+    with _feed_lock:
+        if time.monotonic() - _feed_cache["ts"] >= FEED_CACHE_TTL:
+            data, _ = get_live_feed()
+            body = _dumps(data or {})
+            _feed_cache["body"] = body
+            _feed_cache["gzip"] = (
+                gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
             )
-            rows = cur.fetchall()
-            sessions = []
-            for row in rows:
-                dur = row[7] or 0
-                hours, rem = divmod(dur, 3600)
-                mins, secs = divmod(rem, 60)
-                sessions.append({
-                    "id": row[0],
-                    "started_at": row[1].isoformat() if row[1] else None,
-                    "ended_at": row[2].isoformat() if row[2] else None,
-                    "ticks": row[3] or 0,
-                    "badges": row[4] or 0,
-                    "pokemon_caught": row[5] or 0,
-                    "whiteouts": row[6] or 0,
-                    "duration": f"{hours}h {mins}m {secs}s" if dur > 0 else "running...",
-                })
-            return sessions
-    finally:
-        conn.close()
+            _feed_cache["ts"] = time.monotonic()
+        return _feed_cache["body"], _feed_cache["gzip"]
 
 
 class Handler(BaseHTTPRequestHandler):
     def do_GET(self):
+        gz_body = None
         if self.path == "/" or self.path.startswith("/feed"):
             try:
-                data, updated_at = get_live_feed()
-                body = json.dumps(data or {})
+                body, gz_body = get_feed_body()
                 self.send_response(200)
             except Exception as e:
-                body = json.dumps({"error": str(e)})
+                body = _dumps({"error": str(e)})
                 self.send_response(500)
         elif self.path.startswith("/sessions"):
             try:
                 sessions = get_sessions()
-                body = json.dumps(sessions)
+                body = _dumps(sessions)
                 self.send_response(200)
             except Exception as e:
-                body = json.dumps({"error": str(e)})
+                body = _dumps({"error": str(e)})
                 self.send_response(500)
         elif self.path == "/health":
-            body = json.dumps({"status": "ok"})
+            body = HEALTH_BODY
             self.send_response(200)
         else:
-            body = json.dumps({"error": "not found"})
+            body = NOT_FOUND_BODY
             self.send_response(404)
 
         self.send_header("Content-Type", "application/json")
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gz_body or gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
-        self.wfile.write(body.encode())
+        self.wfile.write(body)
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -140,6 +234,7 @@ class Handler(BaseHTTPRequestHandler):
 if __name__ == "__main__":
     init_db()
     port = int(os.environ.get("PORT", 8080))
-    server = HTTPServer(("0.0.0.0", port), Handler)
+    # One thread per request, so a slow query doesn't hold up other clients
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
     print(f"Pokemon AI API server running on port {port}")
     server.serve_forever()
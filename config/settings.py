@@ -17,11 +17,13 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 # Emulator
 WINDOW_TITLE = os.getenv("WINDOW_TITLE", "mGBA")
 GAME_STATE_FILE = PROJECT_ROOT / "data" / "game_state.json"
+GAME_STATE_POLL_INTERVAL = 0.05  # seconds between game_state.json change checks
 
 # Screenshot
 SCREENSHOT_WIDTH = 480
 SCREENSHOT_HEIGHT = 320
 JPEG_QUALITY = 40
+CAPTURE_INTERVAL = 0.1  # seconds between background frame grabs
 
 # Timing
 TICK_INTERVAL = 0.5
@@ -45,24 +47,32 @@ BUTTON_MAP = {
     "R": "s",
 }
 
-DIRECTION_BUTTONS = {"UP", "DOWN", "LEFT", "RIGHT"}
+DIRECTION_BUTTONS = frozenset({"UP", "DOWN", "LEFT", "RIGHT"})
 
 # ChromaDB
 CHROMA_DIR = PROJECT_ROOT / "chroma_db"
 MEMORY_COLLECTION = "pokemon_memory"
 MEMORY_TOP_K = 5
+MEMORY_WRITE_BATCH = 128   # most memories the background writer stores at once
+MEMORY_WRITE_LINGER = 0.2  # seconds the writer waits for more before writing
 
 # Logging
 LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
 
 # Data files
 TYPE_CHART_FILE = PROJECT_ROOT / "data" / "type_chart.json"
 MAP_NAMES_FILE = PROJECT_ROOT / "data" / "map_names.json"
+SPECIES_NAMES_FILE = PROJECT_ROOT / "data" / "species_names.json"
+MOVE_NAMES_FILE = PROJECT_ROOT / "data" / "move_names.json"
 
 # LLM
 LLM_MAX_TOKENS = 350
 LLM_TEMPERATURE = 0.3
+LLM_TIMEOUT = 60  # seconds per OpenRouter request
+LLM_MAX_RETRIES = 2  # retries on 408/409/429/5xx replies, with backoff
+VISION_CACHE_SIZE = 256  # cached decisions keyed by frame CRC + state
+VISION_CACHE_TTL = 30    # seconds a cached decision stays valid
 
 # Overlay
 OVERLAY_ENABLED = True
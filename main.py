@@ -4,7 +4,10 @@ A vision-based AI that plays Pokemon FireRed using Gemini 2.0 Flash.
 """
 
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 
@@ -12,21 +15,45 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config import settings
 
+BANNER = """
+ ____       _                                _    ___
+|  _ \\ ___ | | _____ _ __ ___   ___  _ __   / \\  |_ _|
+| |_) / _ \\| |/ / _ \\ '_ ` _ \\ / _ \\| '_ \\ / _ \\  | |
+|  __/ (_) |   <  __/ | | | | | (_) | | | / ___ \\ | |
+|_|   \\___/|_|\\_\\___|_| |_| |_|\\___/|_| |_/_/   \\_\\___|
+    Vision AI plays Pokemon FireRed (Gemini 2.0 Flash)
+    """
+
 
 def setup_logging(level="INFO"):
-    """Configure logging to both console and file."""
+    """Configure logging to both console and file.
+
+    Log calls only enqueue the record; a QueueListener thread does the
+    console and file writes.
+    """
     log_format = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
     log_file = settings.LOG_DIR / "pokemon_agent.log"
 
+    formatter = logging.Formatter(log_format)
     handlers = [
         logging.StreamHandler(sys.stdout),
         logging.FileHandler(log_file, mode="a", encoding="utf-8"),
     ]
-
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)  # drains queued records before exit
+
+    # QueueHandler only merges msg % args (and any traceback) into the
+    # message; log_format is applied once, by the listener's handlers
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=getattr(logging, level.upper()),
-        format=log_format,
-        handlers=handlers,
+        handlers=[queue_handler],
     )
 
     # Suppress noisy third-party loggers
@@ -34,7 +61,6 @@ def setup_logging(level="INFO"):
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("chromadb").setLevel(logging.WARNING)
     logging.getLogger("PIL").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
 
 
 def main():
@@ -69,14 +95,8 @@ def main():
     logger = logging.getLogger(__name__)
 
     # Banner
-    logger.info("""
- ____       _                                _    ___
-|  _ \\ ___ | | _____ _ __ ___   ___  _ __   / \\  |_ _|
-| |_) / _ \\| |/ / _ \\ '_ ` _ \\ / _ \\| '_ \\ / _ \\  | |
-|  __/ (_) |   <  __/ | | | | | (_) | | | / ___ \\ | |
-|_|   \\___/|_|\\_\\___|_| |_| |_|\\___/|_| |_/_/   \\_\\___|
-    Vision AI plays Pokemon FireRed (Gemini 2.0 Flash)
-    """)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(BANNER)
 
     # Validate API key
     if not settings.OPENROUTER_API_KEY:
@@ -85,9 +105,11 @@ def main():
 
     # Reset goals if requested
     if args.reset_goals:
-        plans_file = settings.PROJECT_ROOT / "agent" / "planning" / "active_plans.json"
-        if plans_file.exists():
-            plans_file.unlink()
+        plans_dir = settings.PROJECT_ROOT / "agent" / "planning"
+        plans_files = [plans_dir / "active_plans.json", plans_dir / "active_plans.log.jsonl"]
+        if any(f.exists() for f in plans_files):
+            for f in plans_files:
+                f.unlink(missing_ok=True)
             logger.info("Goals reset - starting fresh")
 
     # Initialize database